@@ -0,0 +1,76 @@
+"""
+Agent-level result cache: a whole agent call (prompt building, model call, parsing and
+post-processing) keyed by the agent, its configured model and its inputs.
+Stored in the same SQLite store as raw responses (src/cache.py), so LLM_CACHE / config
+cache settings switch both off. Bump AGENT_CACHE_VERSION when an agent's prompt or
+post-processing changes so stale results are not served.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import typing
+from typing import Any, Awaitable, Callable, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
+
+from src import cache
+from src.config import get_model
+
+AGENT_CACHE_VERSION = 2
+
+T = TypeVar("T")
+
+
+def _key(agent_name: str, key_dict: dict[str, Any]) -> str:
+    return cache.make_key("agent", AGENT_CACHE_VERSION, agent_name, get_model(agent_name), to_jsonable_python(key_dict))
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(fn: Callable[..., Any]) -> TypeAdapter[Any]:
+    """Validate/serialize results by the function's declared return type (model or list of models)."""
+    return TypeAdapter(typing.get_type_hints(fn)["return"])
+
+
+def _load(adapter: TypeAdapter[Any], hit: str | None) -> Any:
+    """Cached result, or None on a miss or an entry that no longer validates (recomputed and overwritten)."""
+    if hit is None:
+        return None
+    try:
+        return adapter.validate_json(hit)
+    except ValidationError:
+        return None
+
+
+def cached(agent_name: str, key_dict: dict[str, Any], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Return fn(*args, **kwargs), served from the cache when the same agent already ran on the
+    same inputs. key_dict must hold every input that affects the output; agent_name is also
+    the config key used to resolve the agent's model.
+    """
+    key = _key(agent_name, key_dict)
+    adapter = _adapter(fn)
+    hit = _load(adapter, cache.get(key))
+    if hit is not None:
+        return hit
+    result = fn(*args, **kwargs)
+    cache.put(key, adapter.dump_json(result).decode("utf-8"))
+    return result
+
+
+async def cached_async(
+    agent_name: str, key_dict: dict[str, Any], fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Async variant of cached() for the concurrent fan-out stages. The SQLite reads and writes
+    run in a worker thread so they do not block the shared event loop.
+    """
+    key = _key(agent_name, key_dict)
+    adapter = _adapter(fn)
+    hit = _load(adapter, await asyncio.to_thread(cache.get, key))
+    if hit is not None:
+        return hit
+    result = await fn(*args, **kwargs)
+    await asyncio.to_thread(cache.put, key, adapter.dump_json(result).decode("utf-8"))
+    return result
@@ -5,22 +5,13 @@ Output: Section 3 slice — ZMOT, alternative paths, retention killers.
 """
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from typing import Callable
 
 from src.config import get_model
-from src.gemini_client import generate_json
-from src.models import PainPoints, PersonaCard
-
-
-def _ensure_str_list(x: Any) -> list[str]:
-    """Coerce to list of strings; LLM sometimes returns a single string for list fields."""
-    if x is None:
-        return []
-    if isinstance(x, list):
-        return [str(i) for i in x]
-    if isinstance(x, str):
-        return [x] if x.strip() else []
-    return []
+from src.gemini_batch import generate_structured_batch, make_request
+from src.gemini_client import generate_structured, generate_structured_async
+from src.models import PainPoints, PainPointsBatch, Segment
 
 
 SYSTEM = (
@@ -29,13 +20,13 @@ SYSTEM = (
     "Respond with valid JSON only."
 )
 
-PROMPT_TEMPLATE = """
-Analyze user behavior and pain points for this segment.
+# Single-segment answers are short; the cap leaves headroom because 2.5 models count thinking tokens in it.
+MAX_OUTPUT_TOKENS = 8192
 
-Category: {category_name}
-Segment: {segment_name}
-Segment context: {segment_context}
+# Batched per-category call (every segment in one answer): allow the model's full output budget.
+BATCH_MAX_OUTPUT_TOKENS = 65536
 
+RESEARCH_QUESTIONS = """
 Research questions:
 1. Zero Moment of Truth: When does the user realize their process is broken?
 2. Alternative paths: What workarounds do users try before paying?
@@ -43,9 +34,9 @@ Research questions:
 4. Persona cards: For each key persona (e.g. "College Student with Social Anxiety", "New grad with burnout") provide: name, demographics, jobs_to_be_done (list), triggers, willingness_to_pay_range, preferred_channels (how they find solutions).
 5. Demand signals: Search trend direction, review volumes for relevant apps, any public conversion/churn evidence (even estimated).
 6. Customer journey: Map ZMOT → alternative paths → retention killers into a short textual journey: trigger → search → trial → adoption → churn.
+"""
 
-Output format (strict JSON, no markdown):
-{{
+OUTPUT_OBJECT = """{
   "category_name": "<category name>",
   "segment_name": "<segment name>",
   "zero_moment_of_truth": "<description>",
@@ -54,16 +45,74 @@ Output format (strict JSON, no markdown):
   "notes": "<optional>",
   "persona_summary": "<who are end users; primary needs>",
   "persona_cards": [
-    {{"name": "<persona name>", "demographics": "<>", "jobs_to_be_done": ["j1","j2"], "triggers": "<>", "willingness_to_pay_range": "<>", "preferred_channels": "<>", "notes": ""}}
+    {"name": "<persona name>", "demographics": "<>", "jobs_to_be_done": ["j1","j2"], "triggers": "<>", "willingness_to_pay_range": "<>", "preferred_channels": "<>", "notes": ""}
   ],
   "jobs_to_be_done": ["<job1>", "<job2>"],
   "demand_signals": "<search trends, forum activity, review volume, conversion/churn if available>",
   "willingness_to_pay": "<evidence or range>",
   "customer_journey_summary": "<trigger → search → trial → adoption → churn (2-4 sentences)>"
-}}
+}"""
+
+# Prompt = static PROMPT_PREFIX (identical for every segment) + small per-segment PROMPT_DYNAMIC.
+PROMPT_PREFIX = """
+Analyze user behavior and pain points for the segment given at the end of this prompt.
+""" + RESEARCH_QUESTIONS + """
+Output format (strict JSON, no markdown):
+""" + OUTPUT_OBJECT + "\n"
+
+PROMPT_DYNAMIC = """
+Category: {category_name}
+Segment: {segment_name}
+Segment context: {segment_context}
+"""
+
+# Row-marshaled variant: every segment of one category in a single call.
+BATCH_PROMPT_PREFIX = """
+Analyze user behavior and pain points for each of the segments of the category given at the end of this prompt.
+""" + RESEARCH_QUESTIONS + """
+Answer the research questions separately for every segment listed below, in the same order.
+
+Output format (strict JSON, no markdown): {"results": [<one object per segment>]} where each object is:
+""" + OUTPUT_OBJECT + "\n"
+
+BATCH_PROMPT_DYNAMIC = """
+Category: {category_name}
+
+Segments to analyze:
+{segment_lines}
 """
 
 
+def _format_prompt(category_name: str, segment_name: str, segment_context: str) -> str:
+    return PROMPT_PREFIX + PROMPT_DYNAMIC.format(
+        category_name=category_name,
+        segment_name=segment_name,
+        segment_context=segment_context or "No additional context.",
+    )
+
+
+def _segment_context(seg: Segment) -> str:
+    return seg.description or seg.notes
+
+
+def _format_batch_prompt(category_name: str, segments: list[Segment]) -> str:
+    segment_lines = "\n".join(
+        f"{i}. Segment: {seg.name}\n   Context: {_segment_context(seg) or 'No additional context.'}"
+        for i, seg in enumerate(segments, 1)
+    )
+    return BATCH_PROMPT_PREFIX + BATCH_PROMPT_DYNAMIC.format(category_name=category_name, segment_lines=segment_lines)
+
+
+def _finalize(result: PainPoints, category_name: str, segment_name: str) -> PainPoints:
+    """Fill names the model left blank with the requested category/segment."""
+    if result.category_name and result.segment_name:
+        return result
+    return result.model_copy(update={
+        "category_name": result.category_name or category_name,
+        "segment_name": result.segment_name or segment_name,
+    })
+
+
 def run(
     category_name: str,
     segment_name: str,
@@ -75,38 +124,139 @@ def run(
     Returns PainPoints for this segment.
     """
     model = model_name or get_model("behavioral_ethologist")
-    prompt = PROMPT_TEMPLATE.format(
-        category_name=category_name,
-        segment_name=segment_name,
-        segment_context=segment_context or "No additional context.",
+    prompt = _format_prompt(category_name, segment_name, segment_context)
+    result = generate_structured(
+        prompt, model, PainPoints, system_instruction=SYSTEM, max_output_tokens=MAX_OUTPUT_TOKENS
     )
-    data = generate_json(prompt, model, system_instruction=SYSTEM)
-
-    persona_cards = []
-    for pc in data.get("persona_cards") or []:
-        if isinstance(pc, dict):
-            persona_cards.append(
-                PersonaCard(
-                    name=pc.get("name") or "",
-                    demographics=pc.get("demographics") or "",
-                    jobs_to_be_done=_ensure_str_list(pc.get("jobs_to_be_done")),
-                    triggers=pc.get("triggers") or "",
-                    willingness_to_pay_range=pc.get("willingness_to_pay_range") or "",
-                    preferred_channels=pc.get("preferred_channels") or "",
-                    notes=pc.get("notes") or "",
-                )
-            )
-    return PainPoints(
-        category_name=data.get("category_name") or category_name,
-        segment_name=data.get("segment_name") or segment_name,
-        zero_moment_of_truth=data.get("zero_moment_of_truth") or "",
-        alternative_paths=_ensure_str_list(data.get("alternative_paths")),
-        retention_killers=_ensure_str_list(data.get("retention_killers")),
-        notes=data.get("notes") or "",
-        persona_summary=data.get("persona_summary") or "",
-        persona_cards=persona_cards,
-        jobs_to_be_done=_ensure_str_list(data.get("jobs_to_be_done")),
-        demand_signals=data.get("demand_signals") or "",
-        willingness_to_pay=data.get("willingness_to_pay") or "",
-        customer_journey_summary=data.get("customer_journey_summary") or "",
+    return _finalize(result, category_name, segment_name)
+
+
+async def run_async(
+    category_name: str,
+    segment_name: str,
+    segment_context: str = "",
+    model_name: str | None = None,
+) -> PainPoints:
+    """Async variant of run() for concurrent fan-out across segments."""
+    model = model_name or get_model("behavioral_ethologist")
+    prompt = _format_prompt(category_name, segment_name, segment_context)
+    result = await generate_structured_async(
+        prompt, model, PainPoints, system_instruction=SYSTEM, max_output_tokens=MAX_OUTPUT_TOKENS
+    )
+    return _finalize(result, category_name, segment_name)
+
+
+def _finalize_batch(
+    batch: PainPointsBatch, category_name: str, segments: list[Segment]
+) -> list[PainPoints | None]:
+    """
+    Align batched results to the requested segments by name. Position is used only when no
+    name matched and the answer has exactly one result per segment; otherwise a dropped
+    segment would shift every later result onto the wrong segment.
+    None marks a segment the batch answer did not cover; callers re-run it on its own.
+    """
+    by_name = {r.segment_name.strip().lower(): r for r in batch.results if r.segment_name}
+    positional = len(batch.results) == len(segments) and not any(
+        seg.name.strip().lower() in by_name for seg in segments
+    )
+    out: list[PainPoints | None] = []
+    for i, seg in enumerate(segments):
+        result = by_name.get(seg.name.strip().lower())
+        if result is None and positional:
+            result = batch.results[i]
+        out.append(None if result is None else result.model_copy(update={
+            "category_name": result.category_name or category_name,
+            "segment_name": seg.name,
+        }))
+    return out
+
+
+def run_batch(
+    category_name: str,
+    segments: list[Segment],
+    model_name: str | None = None,
+) -> list[PainPoints]:
+    """
+    Run Behavioral Ethologist for all segments of one category in a single call.
+    Returns one PainPoints per segment, in input order.
+    """
+    if not segments:
+        return []
+    model = model_name or get_model("behavioral_ethologist")
+    try:
+        batch = generate_structured(
+            _format_batch_prompt(category_name, segments),
+            model,
+            PainPointsBatch,
+            system_instruction=SYSTEM,
+            max_output_tokens=BATCH_MAX_OUTPUT_TOKENS,
+        )
+    except ValueError:
+        batch = PainPointsBatch()  # unparseable (e.g. truncated) batch answer: every segment goes single
+    return [
+        r or run(category_name, seg.name, _segment_context(seg), model)
+        for r, seg in zip(_finalize_batch(batch, category_name, segments), segments)
+    ]
+
+
+async def run_batch_async(
+    category_name: str,
+    segments: list[Segment],
+    model_name: str | None = None,
+) -> list[PainPoints]:
+    """Async variant of run_batch() for concurrent fan-out across categories."""
+    if not segments:
+        return []
+    model = model_name or get_model("behavioral_ethologist")
+    try:
+        batch = await generate_structured_async(
+            _format_batch_prompt(category_name, segments),
+            model,
+            PainPointsBatch,
+            system_instruction=SYSTEM,
+            max_output_tokens=BATCH_MAX_OUTPUT_TOKENS,
+        )
+    except ValueError:
+        batch = PainPointsBatch()
+    results = _finalize_batch(batch, category_name, segments)
+    missing = [i for i, r in enumerate(results) if r is None]
+    retried = await asyncio.gather(*(
+        run_async(category_name, segments[i].name, _segment_context(segments[i]), model) for i in missing
+    ))
+    for i, r in zip(missing, retried):
+        results[i] = r
+    return results
+
+
+def run_batch_job(
+    category_batches: list[tuple[str, list[Segment]]],
+    model_name: str | None = None,
+    progress_callback: Callable[[str], None] | None = None,
+) -> list[list[PainPoints]]:
+    """
+    Run the per-category run_batch() prompts for many categories as one Gemini Batch Mode job.
+    category_batches: (category_name, segments) pairs. Returns one PainPoints list per pair, in order.
+    """
+    if not category_batches:
+        return []
+    model = model_name or get_model("behavioral_ethologist")
+    requests = [
+        make_request(
+            _format_batch_prompt(category_name, segments),
+            model,
+            system_instruction=SYSTEM,
+            max_output_tokens=BATCH_MAX_OUTPUT_TOKENS,
+            response_schema=PainPointsBatch,
+        )
+        for category_name, segments in category_batches
+    ]
+    results = generate_structured_batch(
+        requests, PainPointsBatch, progress_callback=progress_callback, display_name="behavioral_ethologist"
     )
+    return [
+        [
+            r or run(category_name, seg.name, _segment_context(seg), model)
+            for r, seg in zip(_finalize_batch(batch, category_name, segments), segments)
+        ]
+        for batch, (category_name, segments) in zip(results, category_batches)
+    ]
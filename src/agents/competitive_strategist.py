@@ -5,34 +5,13 @@ Output: Section 4 slice — delivery mechanism, gaps, moat assessment.
 """
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from typing import Callable
 
 from src.config import get_model
-from src.gemini_client import generate_json
-from src.models import BattleCard, CompetitionGaps, PainPoints
-
-
-def _ensure_str_list(x: Any) -> list[str]:
-    if x is None:
-        return []
-    if isinstance(x, list):
-        return [str(i) for i in x]
-    if isinstance(x, str):
-        return [x] if x.strip() else []
-    return []
-
-
-def _to_str(v: Any) -> str:
-    """Coerce to str; LLM sometimes returns dict/list for these fields."""
-    if v is None:
-        return ""
-    if isinstance(v, str):
-        return v.strip()
-    if isinstance(v, dict):
-        return " | ".join(f"{k}: {_to_str(x)}" for k, x in v.items())
-    if isinstance(v, list):
-        return "; ".join(_to_str(x) for x in v)
-    return str(v)
+from src.gemini_batch import generate_structured_batch, make_request
+from src.gemini_client import generate_structured, generate_structured_async
+from src.models import CompetitionGaps, CompetitionGapsBatch, PainPoints
 
 
 SYSTEM = (
@@ -41,17 +20,13 @@ SYSTEM = (
     "Respond with valid JSON only."
 )
 
-PROMPT_TEMPLATE = """
-Analyze competition and gaps for this segment, given user pain points.
-
-Category: {category_name}
-Segment: {segment_name}
+# Single-segment answers are short; the cap leaves headroom because 2.5 models count thinking tokens in it.
+MAX_OUTPUT_TOKENS = 8192
 
-User pain points (Section 3):
-- Zero Moment of Truth: {zmot}
-- Alternative paths: {alternative_paths}
-- Retention killers: {retention_killers}
+# Batched per-category call: battle cards for every segment share one answer, so use the full budget.
+BATCH_MAX_OUTPUT_TOKENS = 65536
 
+RESEARCH_QUESTIONS = """
 Research questions:
 1. Delivery mechanisms: API, Managed Service, Mobile App, SaaS? List all that apply.
 2. Product feature gaps vs. experience gaps; moat assessment.
@@ -59,9 +34,9 @@ Research questions:
 4. Competitive feature matrix: Build a grid of 4–6 main players × key features (e.g. personalization, condition-specific, clinician network, price tier). Summarize in feature_matrix_summary (text or structured).
 5. 2×2 positioning map: Define positioning_2x2_axes (e.g. "Degree of specialization (low→high) vs Digital tooling depth" or "Price vs Feature breadth"); positioning_2x2_note describing where incumbents and a hypothetical wedge sit.
 6. Battle cards for key players (e.g. Calm, Headspace, BetterHelp, Lyra for mental health): competitor_name, value_proposition, strengths, weaknesses, pricing, gtm_summary, key_features (list for feature matrix).
+"""
 
-Output format (strict JSON, no markdown):
-{{
+OUTPUT_OBJECT = """{
   "category_name": "<category name>",
   "segment_name": "<segment name>",
   "delivery_mechanisms": ["<e.g. API>", "<e.g. SaaS>"],
@@ -76,12 +51,78 @@ Output format (strict JSON, no markdown):
   "positioning_2x2_axes": "<e.g. Level of specialization vs Digital tooling depth>",
   "positioning_2x2_note": "<where incumbents and wedge sit>",
   "battle_cards": [
-    {{"competitor_name": "<name>", "value_proposition": "<vp>", "strengths": ["s1"], "weaknesses": ["w1"], "pricing": "<>", "gtm_summary": "<brief>", "key_features": ["f1","f2"]}}
+    {"competitor_name": "<name>", "value_proposition": "<vp>", "strengths": ["s1"], "weaknesses": ["w1"], "pricing": "<>", "gtm_summary": "<brief>", "key_features": ["f1","f2"]}
   ]
-}}
+}"""
+
+# Segment inputs go last so everything before them stays the same across calls.
+PROMPT_PREFIX = """
+Analyze competition and gaps for the segment given at the end of this prompt, given its user pain points.
+""" + RESEARCH_QUESTIONS + """
+Output format (strict JSON, no markdown):
+""" + OUTPUT_OBJECT + "\n"
+
+PROMPT_DYNAMIC = """
+Category: {category_name}
+Segment: {segment_name}
+
+User pain points (Section 3):
+- Zero Moment of Truth: {zmot}
+- Alternative paths: {alternative_paths}
+- Retention killers: {retention_killers}
+"""
+
+# Row-marshaled variant: every segment of one category in a single call.
+BATCH_PROMPT_PREFIX = """
+Analyze competition and gaps for each of the segments of the category given at the end of this prompt, given user pain points.
+""" + RESEARCH_QUESTIONS + """
+Answer the research questions separately for every segment listed below, in the same order.
+
+Output format (strict JSON, no markdown): {"results": [<one object per segment>]} where each object is:
+""" + OUTPUT_OBJECT + "\n"
+
+BATCH_PROMPT_DYNAMIC = """
+Category: {category_name}
+
+Segments to analyze:
+{segment_lines}
 """
 
 
+def _format_prompt(pain_points: PainPoints) -> str:
+    return PROMPT_PREFIX + PROMPT_DYNAMIC.format(
+        category_name=pain_points.category_name,
+        segment_name=pain_points.segment_name,
+        zmot=pain_points.zero_moment_of_truth or "Not specified.",
+        alternative_paths="; ".join(pain_points.alternative_paths) or "None specified.",
+        retention_killers="; ".join(pain_points.retention_killers) or "None specified.",
+    )
+
+
+def _format_batch_prompt(pain_points_list: list[PainPoints]) -> str:
+    segment_lines = "\n".join(
+        f"{i}. Segment: {pp.segment_name}\n"
+        f"   - Zero Moment of Truth: {pp.zero_moment_of_truth or 'Not specified.'}\n"
+        f"   - Alternative paths: {'; '.join(pp.alternative_paths) or 'None specified.'}\n"
+        f"   - Retention killers: {'; '.join(pp.retention_killers) or 'None specified.'}"
+        for i, pp in enumerate(pain_points_list, 1)
+    )
+    return BATCH_PROMPT_PREFIX + BATCH_PROMPT_DYNAMIC.format(
+        category_name=pain_points_list[0].category_name,
+        segment_lines=segment_lines,
+    )
+
+
+def _finalize(result: CompetitionGaps, pain_points: PainPoints) -> CompetitionGaps:
+    """Fill names the model left blank with the segment's category/segment."""
+    if result.category_name and result.segment_name:
+        return result
+    return result.model_copy(update={
+        "category_name": result.category_name or pain_points.category_name,
+        "segment_name": result.segment_name or pain_points.segment_name,
+    })
+
+
 def run(
     pain_points: PainPoints,
     model_name: str | None = None,
@@ -91,42 +132,136 @@ def run(
     Returns CompetitionGaps for this segment.
     """
     model = model_name or get_model("competitive_strategist")
-    prompt = PROMPT_TEMPLATE.format(
-        category_name=pain_points.category_name,
-        segment_name=pain_points.segment_name,
-        zmot=pain_points.zero_moment_of_truth or "Not specified.",
-        alternative_paths="; ".join(pain_points.alternative_paths) or "None specified.",
-        retention_killers="; ".join(pain_points.retention_killers) or "None specified.",
+    result = generate_structured(
+        _format_prompt(pain_points),
+        model,
+        CompetitionGaps,
+        system_instruction=SYSTEM,
+        max_output_tokens=MAX_OUTPUT_TOKENS,
+    )
+    return _finalize(result, pain_points)
+
+
+async def run_async(
+    pain_points: PainPoints,
+    model_name: str | None = None,
+) -> CompetitionGaps:
+    """Async variant of run() for concurrent fan-out across segments."""
+    model = model_name or get_model("competitive_strategist")
+    result = await generate_structured_async(
+        _format_prompt(pain_points),
+        model,
+        CompetitionGaps,
+        system_instruction=SYSTEM,
+        max_output_tokens=MAX_OUTPUT_TOKENS,
+    )
+    return _finalize(result, pain_points)
+
+
+def _finalize_batch(
+    batch: CompetitionGapsBatch, pain_points_list: list[PainPoints]
+) -> list[CompetitionGaps | None]:
+    """
+    Align batched results to the requested segments by name; fall back to position only if
+    no name matched and the result count equals the segment count.
+    None marks a segment the batch answer did not cover; callers re-run it on its own.
+    """
+    by_name = {r.segment_name.strip().lower(): r for r in batch.results if r.segment_name}
+    positional = len(batch.results) == len(pain_points_list) and not any(
+        pp.segment_name.strip().lower() in by_name for pp in pain_points_list
     )
-    data = generate_json(prompt, model, system_instruction=SYSTEM)
-
-    battle_cards = []
-    for bc in data.get("battle_cards") or []:
-        if isinstance(bc, dict):
-            battle_cards.append(
-                BattleCard(
-                    competitor_name=bc.get("competitor_name") or "",
-                    value_proposition=bc.get("value_proposition") or "",
-                    strengths=_ensure_str_list(bc.get("strengths")),
-                    weaknesses=_ensure_str_list(bc.get("weaknesses")),
-                    pricing=bc.get("pricing") or "",
-                    gtm_summary=bc.get("gtm_summary") or "",
-                    key_features=_ensure_str_list(bc.get("key_features")),
-                )
-            )
-    return CompetitionGaps(
-        category_name=data.get("category_name") or pain_points.category_name,
-        segment_name=data.get("segment_name") or pain_points.segment_name,
-        delivery_mechanisms=_ensure_str_list(data.get("delivery_mechanisms")),
-        product_feature_gaps=_ensure_str_list(data.get("product_feature_gaps")),
-        experience_gaps=_ensure_str_list(data.get("experience_gaps")),
-        moat_assessment=_to_str(data.get("moat_assessment")),
-        notes=_to_str(data.get("notes")),
-        porter_five_forces_summary=_to_str(data.get("porter_five_forces_summary")),
-        porter_five_forces_detail=_to_str(data.get("porter_five_forces_detail")),
-        competitive_matrix_note=_to_str(data.get("competitive_matrix_note")),
-        feature_matrix_summary=_to_str(data.get("feature_matrix_summary")),
-        positioning_2x2_axes=_to_str(data.get("positioning_2x2_axes")),
-        positioning_2x2_note=_to_str(data.get("positioning_2x2_note")),
-        battle_cards=battle_cards,
+    out: list[CompetitionGaps | None] = []
+    for i, pp in enumerate(pain_points_list):
+        result = by_name.get(pp.segment_name.strip().lower())
+        if result is None and positional:
+            result = batch.results[i]
+        out.append(None if result is None else result.model_copy(update={
+            "category_name": result.category_name or pp.category_name,
+            "segment_name": pp.segment_name,
+        }))
+    return out
+
+
+def run_batch(
+    pain_points_list: list[PainPoints],
+    model_name: str | None = None,
+) -> list[CompetitionGaps]:
+    """
+    Run Competitive Strategist for all segments of one category in a single call.
+    Returns one CompetitionGaps per input PainPoints, in input order.
+    """
+    if not pain_points_list:
+        return []
+    model = model_name or get_model("competitive_strategist")
+    try:
+        batch = generate_structured(
+            _format_batch_prompt(pain_points_list),
+            model,
+            CompetitionGapsBatch,
+            system_instruction=SYSTEM,
+            max_output_tokens=BATCH_MAX_OUTPUT_TOKENS,
+        )
+    except ValueError:
+        batch = CompetitionGapsBatch()  # unparseable (e.g. truncated) batch answer: every segment goes single
+    return [
+        r or run(pp, model) for r, pp in zip(_finalize_batch(batch, pain_points_list), pain_points_list)
+    ]
+
+
+async def run_batch_async(
+    pain_points_list: list[PainPoints],
+    model_name: str | None = None,
+) -> list[CompetitionGaps]:
+    """Async variant of run_batch() for concurrent fan-out across categories."""
+    if not pain_points_list:
+        return []
+    model = model_name or get_model("competitive_strategist")
+    try:
+        batch = await generate_structured_async(
+            _format_batch_prompt(pain_points_list),
+            model,
+            CompetitionGapsBatch,
+            system_instruction=SYSTEM,
+            max_output_tokens=BATCH_MAX_OUTPUT_TOKENS,
+        )
+    except ValueError:
+        batch = CompetitionGapsBatch()
+    results = _finalize_batch(batch, pain_points_list)
+    missing = [i for i, r in enumerate(results) if r is None]
+    retried = await asyncio.gather(*(run_async(pain_points_list[i], model) for i in missing))
+    for i, r in zip(missing, retried):
+        results[i] = r
+    return results
+
+
+def run_batch_job(
+    pain_batches: list[list[PainPoints]],
+    model_name: str | None = None,
+    progress_callback: Callable[[str], None] | None = None,
+) -> list[list[CompetitionGaps]]:
+    """
+    Run the per-category run_batch() prompts for many categories as one Gemini Batch Mode job.
+    pain_batches: one PainPoints list per category. Returns one CompetitionGaps list per input list.
+    """
+    non_empty = [b for b in pain_batches if b]
+    if not non_empty:
+        return [[] for _ in pain_batches]
+    model = model_name or get_model("competitive_strategist")
+    requests = [
+        make_request(
+            _format_batch_prompt(batch),
+            model,
+            system_instruction=SYSTEM,
+            max_output_tokens=BATCH_MAX_OUTPUT_TOKENS,
+            response_schema=CompetitionGapsBatch,
+        )
+        for batch in non_empty
+    ]
+    results = generate_structured_batch(
+        requests, CompetitionGapsBatch, progress_callback=progress_callback, display_name="competitive_strategist"
     )
+    finalized = iter([
+        [r or run(pp, model) for r, pp in zip(_finalize_batch(res, batch), batch)]
+        for res, batch in zip(results, non_empty)
+    ])
+    return [next(finalized) if batch else [] for batch in pain_batches]
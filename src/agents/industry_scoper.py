@@ -10,7 +10,7 @@ from typing import Any, Callable
 
 from src.config import get_model, get_use_deep_research
 from src.deep_research_client import generate_json_via_deep_research
-from src.gemini_client import generate_json
+from src.gemini_client import generate_model
 from src.models import (
     Stage0EOutput,
     TaxonomyCategory,
@@ -27,11 +27,8 @@ SYSTEM = (
     "Respond with valid JSON only."
 )
 
-PROMPT_TEMPLATE = """
-Build an Industry Taxonomy Map for the following industry/area. Deliver a formal 4-level artifact.
-
-Industry/Area: {industry}
-{extra_context}
+PROMPT_PREFIX = """
+Build an Industry Taxonomy Map for the industry/area given at the end of this prompt. Deliver a formal 4-level artifact.
 
 Required outputs:
 
@@ -53,7 +50,7 @@ Required outputs:
 7. **Taxonomy quantification** (at end): Explicit counts — "Categories identified: N; Segments mapped: M"; category size orders of magnitude; growth signal tags per category (e.g. "3 growing, 2 emerging").
 
 Output format (strict JSON, no markdown):
-{{
+{
   "industry": "<industry name>",
   "level1_industry_name": "<explicit Level 1 for taxonomy table>",
   "industry_boundaries": "<1–2 paragraphs>",
@@ -62,35 +59,40 @@ Output format (strict JSON, no markdown):
   "pestel_overview": "<half-page: regulatory, economic, tech, sociocultural drivers>",
   "summary": "<2–3 sentence executive summary>",
   "categories": [
-    {{
+    {
       "name": "<category name>",
       "description": "<short description>",
       "size_range": "<e.g. $10-50B>",
       "growth_signal": "emerging|growing|mature|declining",
       "subcategories": [
-        {{
+        {
           "name": "<subcategory name>",
           "description": "<short description>",
           "segments": [
-            {{
+            {
               "name": "<segment name>",
               "description": "<short description>",
               "key_players_initial": ["<player1>", "<player2>"],
               "size_range": "<e.g. $1-10B>",
               "growth_signal": "emerging|growing|mature|declining"
-            }}
+            }
           ]
-        }}
+        }
       ]
-    }}
+    }
   ],
-  "taxonomy_quantification": {{
+  "taxonomy_quantification": {
     "categories_count": 5,
     "segments_count": 12,
     "size_orders_summary": "<e.g. Category A: $10-50B; Category B: $1-10B>",
     "growth_signals_summary": "<e.g. 3 growing, 2 emerging, 1 mature>"
-  }}
-}}
+  }
+}
+"""
+
+PROMPT_DYNAMIC = """
+Industry/Area: {industry}
+{extra_context}
 """
 
 
@@ -98,38 +100,24 @@ def _ensure_str_list(x: Any) -> list[str]:
     if x is None:
         return []
     if isinstance(x, list):
+        if all(isinstance(i, str) for i in x):
+            return list(x)  # already clean (the usual case): a shallow copy, no per-item str()
         return [str(i) for i in x]
     if isinstance(x, str):
         return [x] if x.strip() else []
     return []
 
 
-def run(
-    industry: str,
-    industry_boundaries_hint: str = "",
-    model_name: str | None = None,
-    use_deep_research: bool | None = None,
-    progress_callback: Callable[[str, float], None] | None = None,
-) -> Stage0EOutput:
-    """
-    Run Industry Scoper (Stage 0E) for exploratory mode.
-    When use_deep_research is True, uses Gemini Deep Research Agent (web search, slower, cited).
-    Returns Stage0EOutput (taxonomy map).
-    """
-    extra = f"Optional context from user: {industry_boundaries_hint}" if industry_boundaries_hint else ""
-    prompt = PROMPT_TEMPLATE.format(industry=industry.strip(), extra_context=extra)
-    use_dr = use_deep_research if use_deep_research is not None else get_use_deep_research()
-    if use_dr:
-        data = generate_json_via_deep_research(
-            prompt,
-            system_instruction=SYSTEM,
-            progress_callback=progress_callback,
-            json_instruction="After your research, output a single valid JSON object with the exact keys shown above (industry, level1_industry_name, industry_boundaries, value_chain_summary, industry_classification, pestel_overview, summary, categories, taxonomy_quantification). No markdown, no code fence.",
-        )
-    else:
-        model = model_name or get_model("industry_scoper")
-        data = generate_json(prompt, model, system_instruction=SYSTEM)
+def _count_taxonomy(categories: list[TaxonomyCategory]) -> TaxonomyQuantification:
+    """Fallback quantification when the model omits it: plain category/segment counts."""
+    return TaxonomyQuantification(
+        categories_count=len(categories),
+        segments_count=sum(len(sc.segments) for tc in categories for sc in tc.subcategories),
+    )
 
+
+def _from_dict(data: dict[str, Any], industry: str) -> Stage0EOutput:
+    """Build Stage0EOutput from the loosely-shaped JSON Deep Research returns."""
     industry_str = data.get("industry") or industry
     level1 = data.get("level1_industry_name") or industry_str
     categories_out = []
@@ -178,10 +166,7 @@ def run(
             growth_signals_summary=(tq.get("growth_signals_summary") or "").strip(),
         )
     else:
-        quant = TaxonomyQuantification(
-            categories_count=len(categories_out),
-            segments_count=sum(len(sc.segments) for tc in categories_out for sc in tc.subcategories),
-        )
+        quant = _count_taxonomy(categories_out)
 
     return Stage0EOutput(
         industry=industry_str,
@@ -194,3 +179,39 @@ def run(
         taxonomy_quantification=quant,
         summary=data.get("summary") or "",
     )
+
+
+def run(
+    industry: str,
+    industry_boundaries_hint: str = "",
+    model_name: str | None = None,
+    use_deep_research: bool | None = None,
+    progress_callback: Callable[[str, float], None] | None = None,
+) -> Stage0EOutput:
+    """
+    Run Industry Scoper (Stage 0E) for exploratory mode.
+    When use_deep_research is True, uses Gemini Deep Research Agent (web search, slower, cited).
+    Returns Stage0EOutput (taxonomy map).
+    """
+    extra = f"Optional context from user: {industry_boundaries_hint}" if industry_boundaries_hint else ""
+    prompt = PROMPT_PREFIX + PROMPT_DYNAMIC.format(industry=industry.strip(), extra_context=extra)
+    use_dr = use_deep_research if use_deep_research is not None else get_use_deep_research()
+    if use_dr:
+        data = generate_json_via_deep_research(
+            prompt,
+            system_instruction=SYSTEM,
+            progress_callback=progress_callback,
+            json_instruction="After your research, output a single valid JSON object with the exact keys shown above (industry, level1_industry_name, industry_boundaries, value_chain_summary, industry_classification, pestel_overview, summary, categories, taxonomy_quantification). No markdown, no code fence.",
+        )
+        return _from_dict(data, industry)
+
+    model = model_name or get_model("industry_scoper")
+    result = generate_model(prompt, model, Stage0EOutput, system_instruction=SYSTEM)
+    industry_str = result.industry or industry
+    updates: dict[str, Any] = {
+        "industry": industry_str,
+        "level1_industry_name": result.level1_industry_name or industry_str,
+    }
+    if result.taxonomy_quantification is None:
+        updates["taxonomy_quantification"] = _count_taxonomy(result.categories)
+    return result.model_copy(update=updates)
@@ -8,8 +8,8 @@ from __future__ import annotations
 from typing import Any
 
 from src.config import get_model
-from src.gemini_client import generate_json
-from src.models import SegmentPositioningBrief, Stage5Output, _ensure_str_list
+from src.gemini_client import generate_model
+from src.models import Stage5Output
 
 
 SYSTEM = (
@@ -18,11 +18,8 @@ SYSTEM = (
     "positioning briefs per recommended segment. Respond with valid JSON only."
 )
 
-PROMPT_TEMPLATE = """
-Produce a Positioning & GTM document for this opportunity (Problem-Driven mode).
-
-ARTIFACT (summary of research so far):
-{artifact_json}
+PROMPT_PREFIX = """
+Produce a Positioning & GTM document for the opportunity summarized at the end of this prompt (Problem-Driven mode).
 
 Required outputs:
 
@@ -40,7 +37,7 @@ Required outputs:
    - proposed_offering, unique_edge, price_anchor (e.g. "$X/month D2C or $Y PMPM").
 
 Output format (strict JSON, no markdown):
-{{
+{
   "unique_competitive_advantage": "<paragraph>",
   "positioning_summary": "<where we sit vs. competitors>",
   "positioning_statement": "<one-liner>",
@@ -52,9 +49,14 @@ Output format (strict JSON, no markdown):
   "gtm_strategy": "<go-to-market summary>",
   "recommended_investors": ["<investor1>", "<investor2>"],
   "segment_briefs": [
-    {{"segment_name": "<>", "problem_statement": "<>", "target_user": "<>", "current_alternatives": "<>", "why_now": "<>", "proposed_offering": "<>", "unique_edge": "<>", "price_anchor": "<>"}}
+    {"segment_name": "<>", "problem_statement": "<>", "target_user": "<>", "current_alternatives": "<>", "why_now": "<>", "proposed_offering": "<>", "unique_edge": "<>", "price_anchor": "<>"}
   ]
-}}
+}
+"""
+
+PROMPT_DYNAMIC = """
+ARTIFACT (summary of research so far):
+{artifact_json}
 """
 
 
@@ -90,36 +92,5 @@ def run(artifact: dict[str, Any], model_name: str | None = None) -> Stage5Output
     """
     model = model_name or get_model("positioning")
     summary = _artifact_summary(artifact)
-    prompt = PROMPT_TEMPLATE.format(artifact_json=summary)
-    data = generate_json(prompt, model, system_instruction=SYSTEM)
-
-    investors = _ensure_str_list(data.get("recommended_investors"))
-
-    briefs = []
-    for b in data.get("segment_briefs") or []:
-        if isinstance(b, dict):
-            briefs.append(
-                SegmentPositioningBrief(
-                    segment_name=b.get("segment_name") or "",
-                    problem_statement=b.get("problem_statement") or "",
-                    target_user=b.get("target_user") or "",
-                    current_alternatives=b.get("current_alternatives") or "",
-                    why_now=b.get("why_now") or "",
-                    proposed_offering=b.get("proposed_offering") or "",
-                    unique_edge=b.get("unique_edge") or "",
-                    price_anchor=b.get("price_anchor") or "",
-                )
-            )
-    return Stage5Output(
-        unique_competitive_advantage=data.get("unique_competitive_advantage") or "",
-        positioning_summary=data.get("positioning_summary") or "",
-        positioning_statement=data.get("positioning_statement") or "",
-        perceptual_map_2x2_note=data.get("perceptual_map_2x2_note") or "",
-        pricing_strategy=data.get("pricing_strategy") or "",
-        price_anchor_per_segment=data.get("price_anchor_per_segment") or "",
-        funding_required=data.get("funding_required") or "",
-        break_even_summary=data.get("break_even_summary") or "",
-        gtm_strategy=data.get("gtm_strategy") or "",
-        recommended_investors=investors,
-        segment_briefs=briefs,
-    )
+    prompt = PROMPT_PREFIX + PROMPT_DYNAMIC.format(artifact_json=summary)
+    return generate_model(prompt, model, Stage5Output, system_instruction=SYSTEM)
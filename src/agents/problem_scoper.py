@@ -6,7 +6,7 @@ Output: Problem Statement Brief (1–2 page equivalent).
 from __future__ import annotations
 
 from src.config import get_model
-from src.gemini_client import generate_json
+from src.gemini_client import generate_model
 from src.models import Stage0POutput
 
 
@@ -16,9 +16,27 @@ SYSTEM = (
     "current spend, existing solutions, and hypotheses. Respond with valid JSON only."
 )
 
-PROMPT_TEMPLATE = """
-Create a Problem Statement Brief from the following inputs (Problem-Driven research).
+# The brief is a handful of short fields; the rest of the cap is thinking headroom.
+MAX_OUTPUT_TOKENS = 8192
 
+PROMPT_PREFIX = """
+Create a Problem Statement Brief from the inputs given at the end of this prompt (Problem-Driven research).
+
+Produce a structured brief. Output format (strict JSON, no markdown):
+{
+  "problem_statement": "<refined 1–2 paragraph problem definition>",
+  "target_user": "<who is affected>",
+  "target_segment": "<target segment>",
+  "market_money": "<where money is spent; budget line; who is incentivized>",
+  "user_behavior": "<when pain occurs; what users try first; why solutions fail>",
+  "competition": "<good enough incumbents; why people still complain>",
+  "ai_advantage": "<expensive/slow/inconsistent human effort; repetitive high-impact decisions>",
+  "hypotheses": ["<hypothesis1>", "<hypothesis2>"],
+  "summary": "<2–3 sentence executive summary of the problem and opportunity>"
+}
+"""
+
+PROMPT_DYNAMIC = """
 Industry/Area: {industry}
 
 Problem statement (user): {problem_statement}
@@ -33,19 +51,6 @@ Validation inputs (expand and structure these into the brief):
 - AI Advantage: {ai_advantage}
 
 Hypotheses to validate (user): {hypotheses}
-
-Produce a structured brief. Output format (strict JSON, no markdown):
-{{
-  "problem_statement": "<refined 1–2 paragraph problem definition>",
-  "target_user": "<who is affected>",
-  "target_segment": "<target segment>",
-  "market_money": "<where money is spent; budget line; who is incentivized>",
-  "user_behavior": "<when pain occurs; what users try first; why solutions fail>",
-  "competition": "<good enough incumbents; why people still complain>",
-  "ai_advantage": "<expensive/slow/inconsistent human effort; repetitive high-impact decisions>",
-  "hypotheses": ["<hypothesis1>", "<hypothesis2>"],
-  "summary": "<2–3 sentence executive summary of the problem and opportunity>"
-}}
 """
 
 
@@ -68,7 +73,7 @@ def run(
     model = model_name or get_model("problem_scoper")
     hyp_list = hypotheses or []
     hyp_str = "\n".join(f"- {h}" for h in hyp_list) if hyp_list else "None provided."
-    prompt = PROMPT_TEMPLATE.format(
+    prompt = PROMPT_PREFIX + PROMPT_DYNAMIC.format(
         industry=industry.strip(),
         problem_statement=(problem_statement or "Not provided.").strip(),
         target_user=(target_user or "Not specified.").strip(),
@@ -79,22 +84,15 @@ def run(
         ai_advantage=(ai_advantage or "Not provided.").strip(),
         hypotheses=hyp_str,
     )
-    data = generate_json(prompt, model, system_instruction=SYSTEM)
-
-    raw_hyps = data.get("hypotheses")
-    if isinstance(raw_hyps, list):
-        hyp_out = [str(h) for h in raw_hyps]
-    else:
-        hyp_out = hyp_list
-
-    return Stage0POutput(
-        problem_statement=data.get("problem_statement") or "",
-        target_user=data.get("target_user") or target_user,
-        target_segment=data.get("target_segment") or target_segment,
-        market_money=data.get("market_money") or "",
-        user_behavior=data.get("user_behavior") or "",
-        competition=data.get("competition") or "",
-        ai_advantage=data.get("ai_advantage") or "",
-        hypotheses=hyp_out,
-        summary=data.get("summary") or "",
+    result = generate_model(
+        prompt, model, Stage0POutput, system_instruction=SYSTEM, max_output_tokens=MAX_OUTPUT_TOKENS
     )
+
+    updates = {}
+    if not result.target_user and target_user:
+        updates["target_user"] = target_user
+    if not result.target_segment and target_segment:
+        updates["target_segment"] = target_segment
+    if not result.hypotheses and hyp_list:
+        updates["hypotheses"] = hyp_list
+    return result.model_copy(update=updates) if updates else result
@@ -5,21 +5,12 @@ Output: Section 1 — categories with TAM/SOM, CAGRs (2024–2030), trends.
 """
 from __future__ import annotations
 
-from typing import Any
+from typing import Callable
 
 from src.config import get_model
-from src.gemini_client import generate_json
-from src.models import Category, Section1
-
-
-def _ensure_str_list(x: Any) -> list[str]:
-    if x is None:
-        return []
-    if isinstance(x, list):
-        return [str(i) for i in x]
-    if isinstance(x, str):
-        return [x] if x.strip() else []
-    return []
+from src.gemini_batch import generate_structured_batch, make_request
+from src.gemini_client import generate_structured
+from src.models import Section1
 
 
 SYSTEM = (
@@ -27,10 +18,8 @@ SYSTEM = (
     "logical categories and provide TAM/SOM and CAGR data. Always respond with valid JSON only."
 )
 
-PROMPT_TEMPLATE = """
-Analyze the following industry/area and produce a decomposition tree (categories) with market metrics.
-
-Industry/Area: {industry}
+PROMPT_PREFIX = """
+Analyze the industry/area given at the end of this prompt and produce a decomposition tree (categories) with market metrics.
 
 Answer these research questions and output a single JSON object:
 1. What are the core technical or service-based Categories in this industry? (List 3–7 categories.)
@@ -40,11 +29,11 @@ Answer these research questions and output a single JSON object:
 5. What are the core market trends for each category?
 
 Output format (strict JSON, no markdown):
-{{
+{
   "industry": "<industry name>",
   "summary": "<2–3 sentence executive summary of the industry and key metrics>",
   "categories": [
-    {{
+    {
       "name": "<category name>",
       "description": "<short description>",
       "tam": "<TAM estimate>",
@@ -52,39 +41,42 @@ Output format (strict JSON, no markdown):
       "historical_cagr": "<e.g. 8%>",
       "projected_cagr": "<e.g. 12%>",
       "trends": ["<trend1>", "<trend2>"]
-    }}
+    }
   ]
-}}
+}
+"""
+
+PROMPT_DYNAMIC = """
+Industry/Area: {industry}
 """
 
 
+def _finalize(result: Section1, industry: str) -> Section1:
+    """Fall back to the requested industry name if the model left it blank."""
+    if result.industry:
+        return result
+    return result.model_copy(update={"industry": industry})
+
+
 def run(industry: str, model_name: str | None = None) -> Section1:
     """
     Run Taxonomy Architect on the given industry.
     Returns Section1 (categories, market cap, trends).
     """
     model = model_name or get_model("taxonomy")
-    prompt = PROMPT_TEMPLATE.format(industry=industry.strip())
-    data = generate_json(prompt, model, system_instruction=SYSTEM)
+    prompt = PROMPT_PREFIX + PROMPT_DYNAMIC.format(industry=industry.strip())
+    result = generate_structured(prompt, model, Section1, system_instruction=SYSTEM)
+    return _finalize(result, industry)
 
-    industry_str = data.get("industry") or industry
-    summary = data.get("summary") or ""
-    raw_cats = data.get("categories") or []
-    categories = []
-    for c in raw_cats:
-        if isinstance(c, dict):
-            categories.append(
-                Category(
-                    name=c.get("name") or "Unnamed",
-                    description=c.get("description") or "",
-                    tam=c.get("tam") or "",
-                    som=c.get("som") or "",
-                    historical_cagr=c.get("historical_cagr") or "",
-                    projected_cagr=c.get("projected_cagr") or "",
-                    trends=_ensure_str_list(c.get("trends")),
-                )
-            )
-        elif isinstance(c, str):
-            categories.append(Category(name=c))
 
-    return Section1(industry=industry_str, summary=summary, categories=categories)
+def run_batch_job(
+    industry: str,
+    model_name: str | None = None,
+    progress_callback: Callable[[str], None] | None = None,
+) -> Section1:
+    """Run Taxonomy Architect through Gemini Batch Mode (non-interactive runs)."""
+    model = model_name or get_model("taxonomy")
+    prompt = PROMPT_PREFIX + PROMPT_DYNAMIC.format(industry=industry.strip())
+    request = make_request(prompt, model, system_instruction=SYSTEM, response_schema=Section1)
+    [result] = generate_structured_batch([request], Section1, progress_callback=progress_callback, display_name="taxonomy")
+    return _finalize(result, industry)
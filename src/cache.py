@@ -0,0 +1,76 @@
+"""
+Persistent response cache: content-addressed SQLite store for raw model responses.
+Keys are blake2b digests of the canonical request tuple (see make_key), so identical
+prompts across runs or Streamlit reloads skip the network entirely.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+_conn: sqlite3.Connection | None = None
+_enabled: bool | None = None
+_lock = threading.Lock()
+
+
+def make_key(*parts: Any) -> str:
+    """Hash the canonical JSON form of the parts (e.g. model, system, prompt, temperature)."""
+    canonical = json.dumps(parts, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_conn() -> sqlite3.Connection | None:
+    """Open the cache database on first use; None when caching is disabled or unavailable."""
+    global _conn, _enabled
+    if _enabled is None:
+        from src.config import get_cache_enabled, get_cache_path  # config imports gemini_client, which imports us
+
+        _enabled = get_cache_enabled()
+        if _enabled:
+            try:
+                path = Path(get_cache_path())
+                path.parent.mkdir(parents=True, exist_ok=True)
+                _conn = sqlite3.connect(str(path), check_same_thread=False)
+                _conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(hash TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+                )
+                _conn.commit()
+            except sqlite3.Error:
+                _enabled = False
+                _conn = None
+    return _conn
+
+
+def get(key: str) -> str | None:
+    """Return the cached response for key, or None on miss (or when caching is off)."""
+    with _lock:
+        conn = _get_conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT response FROM responses WHERE hash = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+    return row[0] if row else None
+
+
+def put(key: str, value: str) -> None:
+    """Store a response under key (no-op when caching is off)."""
+    with _lock:
+        conn = _get_conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (hash, response, created_at) VALUES (?, ?, ?)",
+                (key, value, int(time.time())),
+            )
+            conn.commit()
+        except sqlite3.Error:
+            pass
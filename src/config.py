@@ -7,51 +7,116 @@ import os
 from pathlib import Path
 from typing import Any
 
-from src.gemini_client import DEFAULT_MODELS
+from src.gemini_client import DEFAULT_MAX_CONCURRENCY, DEFAULT_MODELS, DEFAULT_REQUESTS_PER_MINUTE
+
+try:
+    import yaml
+except ImportError:  # config.yaml is optional; without PyYAML we run on defaults
+    yaml = None
+
+EXECUTION_MODE_SYNC = "sync"
+EXECUTION_MODE_BATCH = "batch"
+EXECUTION_MODES = (EXECUTION_MODE_SYNC, EXECUTION_MODE_BATCH)
+
+_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
 
 _config: dict[str, Any] | None = None
+# Hot-path values, resolved once by _load_config so accessors are a single lookup
+_MODELS: dict[str, str] = {}
+_MAX_CATS: int | None = None
+_MAX_SEGS: int | None = None
 
 
 def _load_config() -> dict[str, Any]:
-    global _config
+    global _config, _MODELS, _MAX_CATS, _MAX_SEGS
     if _config is not None:
         return _config
-    try:
-        import yaml
-        path = Path(__file__).resolve().parent.parent / "config.yaml"
-        if path.exists():
-            with open(path, encoding="utf-8") as f:
-                _config = yaml.safe_load(f) or {}
-        else:
-            _config = {}
-    except Exception:
-        _config = {}
+    cfg: dict[str, Any] = {}
+    if yaml is not None and _CONFIG_PATH.exists():
+        try:
+            with open(_CONFIG_PATH, encoding="utf-8") as f:
+                cfg = yaml.safe_load(f) or {}
+        except Exception:
+            cfg = {}
+    limits = cfg.get("limits") or {}
+    _MODELS = {**DEFAULT_MODELS, **{k: v for k, v in (cfg.get("models") or {}).items() if v}}
+    _MAX_CATS = limits.get("max_categories", 0) or None
+    _MAX_SEGS = limits.get("max_segments_per_category", 0) or None
+    _config = cfg
     return _config
 
 
 def get_model(agent_key: str) -> str:
     """Return model name for agent (e.g. 'taxonomy', 'segment_specialist')."""
-    cfg = _load_config()
-    models = cfg.get("models") or {}
-    return models.get(agent_key) or DEFAULT_MODELS.get(agent_key, "gemini-2.5-flash")
+    if _config is None:
+        _load_config()
+    return _MODELS.get(agent_key) or "gemini-2.5-flash"
 
 
 def get_max_categories() -> int | None:
     """Return max categories limit (0 or missing = None)."""
-    cfg = _load_config()
-    n = cfg.get("limits") or {}
-    v = n.get("max_categories", 0)
-    return None if v == 0 else v
+    if _config is None:
+        _load_config()
+    return _MAX_CATS
 
 
 def get_max_segments_per_category() -> int | None:
     """Return max segments per category (0 or missing = None)."""
+    if _config is None:
+        _load_config()
+    return _MAX_SEGS
+
+
+def get_max_concurrency() -> int:
+    """Return max in-flight Gemini calls (env GEMINI_MAX_CONCURRENCY overrides config)."""
+    env_val = os.environ.get("GEMINI_MAX_CONCURRENCY", "").strip()
+    if env_val.isdigit() and int(env_val) > 0:
+        return int(env_val)
+    cfg = _load_config()
+    n = cfg.get("limits") or {}
+    return n.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY
+
+
+def get_requests_per_minute() -> int | None:
+    """Return Gemini requests-per-minute cap (0 = no limit; missing = default)."""
     cfg = _load_config()
     n = cfg.get("limits") or {}
-    v = n.get("max_segments_per_category", 0)
+    v = n.get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE)
     return None if v == 0 else v
 
 
+def get_cache_enabled() -> bool:
+    """Return True if raw Gemini responses should be cached on disk (env LLM_CACHE=0 disables)."""
+    env_val = os.environ.get("LLM_CACHE", "").strip().lower()
+    if env_val in ("1", "true", "yes"):
+        return True
+    if env_val in ("0", "false", "no"):
+        return False
+    cfg = _load_config()
+    c = cfg.get("cache") or {}
+    return bool(c.get("enabled", True))
+
+
+def get_cache_path() -> Path:
+    """Return the response cache database path (relative paths resolve against the project root)."""
+    cfg = _load_config()
+    c = cfg.get("cache") or {}
+    path = Path(c.get("path") or ".cache/llm_responses.sqlite3")
+    if not path.is_absolute():
+        path = Path(__file__).resolve().parent.parent / path
+    return path
+
+
+def get_execution_mode() -> str:
+    """Return "sync" (interactive calls) or "batch" (Gemini Batch Mode; env GEMINI_EXECUTION_MODE overrides)."""
+    env_val = os.environ.get("GEMINI_EXECUTION_MODE", "").strip().lower()
+    if env_val in EXECUTION_MODES:
+        return env_val
+    cfg = _load_config()
+    v = str(cfg.get("execution_mode") or EXECUTION_MODE_SYNC).strip().lower()
+    return v if v in EXECUTION_MODES else EXECUTION_MODE_SYNC
+
+
 def get_use_deep_research() -> bool:
     """Return True if Deep Research agent should be used for data/insights (slower, web-backed)."""
     env_val = os.environ.get("USE_DEEP_RESEARCH", "").strip().lower()
@@ -0,0 +1,204 @@
+"""
+Gemini Batch Mode (inline requests) for non-interactive runs.
+Batch jobs cost about half as much as interactive calls and are not subject to per-minute
+rate limits, but complete in minutes to hours. Used by the orchestrator when
+execution_mode is "batch" (config.yaml or GEMINI_EXECUTION_MODE).
+See: https://ai.google.dev/gemini-api/docs/batch-mode
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, TypeVar
+
+from google.genai import types
+from pydantic import BaseModel
+
+from src import cache
+from src.gemini_client import (
+    _cache_key,
+    _get_client,
+    _make_config,
+    _require_client,
+    cache_response,
+    generate,
+    generate_structured,
+)
+
+
+# Poll every N seconds while a job is queued/running
+DEFAULT_POLL_INTERVAL = 30
+
+# Max wait (hours) before giving up; Batch Mode targets 24h turnaround
+MAX_WAIT_HOURS = 24
+
+_FAILED_STATES = {"JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"}
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def make_request(
+    prompt: str,
+    model_name: str,
+    *,
+    system_instruction: str | None = None,
+    temperature: float = 0.2,
+    max_output_tokens: int = 16384,
+    response_schema: type[BaseModel] | None = None,
+) -> dict[str, Any]:
+    """Build one inline request: the same model/contents/config an interactive generate() call sends."""
+    return {
+        "model": model_name,
+        "contents": prompt,
+        "config": _make_config(system_instruction, temperature, max_output_tokens, response_schema),
+    }
+
+
+def submit_batch(requests: list[dict[str, Any]], *, display_name: str | None = None) -> str:
+    """
+    Create an inline batch job for the given requests and return its job name.
+    A job runs a single model, so all requests must share one (each pipeline layer does).
+    """
+    models = {r["model"] for r in requests}
+    if len(models) != 1:
+        raise ValueError(f"A batch job runs a single model; got {sorted(models)}")
+
+    client = _require_client()
+    job = client.batches.create(
+        model=requests[0]["model"],
+        src=[types.InlinedRequest(contents=r["contents"], config=r["config"]) for r in requests],
+        config=types.CreateBatchJobConfig(display_name=display_name) if display_name else None,
+    )
+    if not job.name:
+        raise RuntimeError("Batch job creation returned no job name.")
+    return job.name
+
+
+def poll_batch(
+    job_id: str,
+    *,
+    progress_callback: Callable[[str], None] | None = None,
+    poll_interval_seconds: int = DEFAULT_POLL_INTERVAL,
+) -> list[dict[str, Any]]:
+    """
+    Wait for a batch job to finish. Returns one {"text": str, "error": str | None} dict
+    per request, in submission order.
+    Raises RuntimeError if the job fails, is cancelled/expired, or exceeds MAX_WAIT_HOURS.
+    """
+    client = _get_client()
+    deadline = time.monotonic() + MAX_WAIT_HOURS * 3600
+
+    while True:
+        try:
+            job = client.batches.get(name=job_id)
+        except Exception as e:
+            job = None
+            if progress_callback:
+                progress_callback(f"Polling batch job… ({e})")
+        if job is not None:
+            state = getattr(job.state, "value", job.state) or ""
+            if state in _DONE_STATES:
+                break
+            if state in _FAILED_STATES:
+                raise RuntimeError(f"Batch job {job_id} ended with state {state}: {job.error or ''}")
+            if progress_callback:
+                progress_callback(f"Batch job in progress… (state: {state})")
+        if time.monotonic() > deadline:
+            raise RuntimeError(
+                f"Batch job did not complete within {MAX_WAIT_HOURS} hours. "
+                f"Job name: {job_id}. You may check status later with this name."
+            )
+        time.sleep(poll_interval_seconds)
+
+    results: list[dict[str, Any]] = []
+    for item in (job.dest.inlined_responses if job.dest else None) or []:
+        if item.error or item.response is None:
+            results.append({"text": "", "error": str(item.error or "empty response")})
+        else:
+            results.append({"text": (item.response.text or "").strip(), "error": None})
+    return results
+
+
+def generate_batch(
+    requests: list[dict[str, Any]],
+    *,
+    progress_callback: Callable[[str], None] | None = None,
+    display_name: str | None = None,
+) -> list[str]:
+    """
+    Run requests through Batch Mode and return the response texts in order.
+    Cached responses are served from disk and only misses are submitted; requests the
+    job could not answer are retried interactively via generate(). Like generate(), replies
+    are not stored here (see generate_structured_batch).
+    """
+    texts: list[str | None] = []
+    for r in requests:
+        cfg = r["config"]
+        texts.append(cache.get(
+            _cache_key(r["contents"], r["model"], cfg.system_instruction, cfg.temperature, cfg.response_schema)
+        ))
+
+    pending = [i for i, t in enumerate(texts) if t is None]
+    if pending:
+        job_id = submit_batch([requests[i] for i in pending], display_name=display_name)
+        if progress_callback:
+            progress_callback(f"Batch job submitted ({len(pending)} requests): {job_id}")
+        results = poll_batch(job_id, progress_callback=progress_callback)
+        for n, i in enumerate(pending):
+            res = results[n] if n < len(results) else {"text": "", "error": "missing response"}
+            if res["error"] is None and res["text"]:
+                texts[i] = res["text"]
+
+    for i, t in enumerate(texts):
+        if t is None:
+            r = requests[i]
+            cfg = r["config"]
+            texts[i] = generate(
+                r["contents"],
+                r["model"],
+                system_instruction=cfg.system_instruction,
+                temperature=cfg.temperature,
+                max_output_tokens=cfg.max_output_tokens,
+                response_schema=cfg.response_schema,
+            )
+    return [t or "" for t in texts]
+
+
+def generate_structured_batch(
+    requests: list[dict[str, Any]],
+    schema: type[M],
+    *,
+    progress_callback: Callable[[str], None] | None = None,
+    display_name: str | None = None,
+) -> list[M]:
+    """
+    Batch variant of generate_structured(): validate each response into the schema model.
+    An item that does not validate is re-run on its own through generate_structured(), so one
+    bad reply does not fail the whole job; replies are cached once they validate.
+    """
+    texts = generate_batch(requests, progress_callback=progress_callback, display_name=display_name)
+    results: list[M] = []
+    for r, text in zip(requests, texts):
+        cfg = r["config"]
+        try:
+            result = schema.model_validate_json(text)
+        except ValueError:
+            result = generate_structured(
+                r["contents"],
+                r["model"],
+                schema,
+                system_instruction=cfg.system_instruction,
+                max_output_tokens=cfg.max_output_tokens,
+                use_cache=False,
+            )
+        else:
+            cache_response(
+                r["contents"],
+                r["model"],
+                text,
+                system_instruction=cfg.system_instruction,
+                temperature=cfg.temperature,
+                response_schema=cfg.response_schema,
+            )
+        results.append(result)
+    return results
@@ -2,14 +2,24 @@
 Thin wrapper over Google Gemini API (google-genai SDK): model selection, retries, token limits.
 Uses Gemini 2.5 models per https://ai.google.dev/gemini-api/docs/models
 """
-import json
+import asyncio
+import concurrent.futures
+import functools
 import os
+import random
 import re
+import threading
 import time
-from typing import Any
+from collections.abc import Coroutine, Iterator
+from typing import Any, TypeVar
 
+import httpx
+import orjson
 from google import genai
 from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+from src import cache
 
 # Default models (Gemini 2.5 per official docs). Override via config.yaml.
 # See https://ai.google.dev/gemini-api/docs/models
@@ -28,8 +38,65 @@ DEFAULT_MODELS = {
 # Retry config
 MAX_RETRIES = 3
 INITIAL_BACKOFF = 2.0
+MAX_BACKOFF = 60.0
+
+# Async throughput limits (override via config.yaml limits or GEMINI_MAX_CONCURRENCY)
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+# Pooled HTTP transport shared by every call (one TLS session, multiplexed when h2 is installed)
+HTTP_MAX_CONNECTIONS = 32
 
 _client: genai.Client | None = None
+_http_client: httpx.Client | None = None
+_http_async_client: httpx.AsyncClient | None = None
+_api_key: str = ""  # resolved with the client (see _get_client)
+_secrets_key: str | None = None  # Streamlit secrets fallback, looked up once
+
+# Background event loop shared by all async calls (see submit / run_sync)
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+# Requests currently being sent, by cache key (only touched from the background loop)
+_inflight: dict[str, "asyncio.Task[str]"] = {}
+# Callers currently awaiting each in-flight request; the last one to be cancelled cancels it
+_waiters: dict[str, int] = {}
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+# JSON extraction / repair patterns (compiled once; responses can be multi-KB)
+_CODE_FENCE = re.compile(r"```(?:json)?\s*([\s\S]*?)```", re.IGNORECASE)
+_TRAIL_OBJ = re.compile(r",\s*}")
+_TRAIL_ARR = re.compile(r",\s*]")
+
+
+class TokenBucket:
+    """Async token bucket: bursts up to `capacity` requests, refilled at `refill_rate` tokens/second."""
+
+    def __init__(self, capacity: float, refill_rate: float) -> None:
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.refill_rate)
+
+
+# Created lazily on the background loop (see _get_limits)
+_sem: asyncio.Semaphore | None = None
+_bucket: TokenBucket | None = None
 
 
 def get_api_key() -> str:
@@ -37,28 +104,74 @@ def get_api_key() -> str:
     key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
     if key:
         return key
+    global _secrets_key
+    if _secrets_key is None:
+        # Streamlit import + secrets lookup happen at most once per process
+        _secrets_key = ""
+        try:
+            import streamlit as st
+            if hasattr(st, "secrets") and st.secrets:
+                _secrets_key = st.secrets.get("GEMINI_API_KEY") or st.secrets.get("GOOGLE_API_KEY") or ""
+        except Exception:
+            pass
+    return _secrets_key
+
+
+def _http_options() -> types.HttpOptions:
+    """
+    Keep-alive httpx clients for the SDK's sync and async paths, so the ~20 calls of a run
+    reuse pooled connections instead of paying TCP/TLS setup each time. HTTP/2 is enabled
+    only when the h2 package is available (httpx[http2]).
+    """
+    global _http_client, _http_async_client
     try:
-        import streamlit as st
-        if hasattr(st, "secrets") and st.secrets:
-            return st.secrets.get("GEMINI_API_KEY") or st.secrets.get("GOOGLE_API_KEY") or ""
-    except Exception:
-        pass
-    return ""
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+    if _http_client is None:
+        _http_client = httpx.Client(http2=http2, limits=limits)
+    if _http_async_client is None:
+        _http_async_client = httpx.AsyncClient(http2=http2, limits=limits)
+    return types.HttpOptions(httpx_client=_http_client, httpx_async_client=_http_async_client)
 
 
 def _get_client() -> genai.Client:
     """Return a configured Client (uses GEMINI_API_KEY from env if set)."""
-    global _client
+    global _client, _api_key
     if _client is not None:
         return _client
-    key = get_api_key()
-    if key:
-        _client = genai.Client(api_key=key)
+    _api_key = _api_key or get_api_key()
+    if _api_key:
+        _client = genai.Client(api_key=_api_key, http_options=_http_options())
     else:
-        _client = genai.Client()
+        _client = genai.Client(http_options=_http_options())
     return _client
 
 
+def _require_client() -> genai.Client:
+    """Client for generate calls; the API key is resolved once with the client, not on every request."""
+    global _api_key
+    if not _api_key:
+        _api_key = get_api_key()
+        if not _api_key:
+            raise ValueError("GEMINI_API_KEY not set. Add it to .env or Streamlit secrets.")
+    return _get_client()
+
+
+def _get_limits() -> tuple[asyncio.Semaphore, TokenBucket | None]:
+    """Return the shared concurrency semaphore and rate limiter (built from config on first use)."""
+    global _sem, _bucket
+    if _sem is None:
+        from src.config import get_max_concurrency, get_requests_per_minute  # config imports this module
+
+        _sem = asyncio.Semaphore(get_max_concurrency())
+        rpm = get_requests_per_minute()
+        _bucket = TokenBucket(capacity=rpm, refill_rate=rpm / 60) if rpm else None
+    return _sem, _bucket
+
+
 def _is_retryable(e: Exception) -> bool:
     """Whether to retry (rate limit, transient). Do not retry NotFound."""
     msg = str(e).lower()
@@ -71,6 +184,70 @@ def _is_retryable(e: Exception) -> bool:
     return False
 
 
+def _retry_after(e: Exception) -> float | None:
+    """Server-requested delay in seconds (Retry-After header or RetryInfo.retryDelay), if the error carries one."""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if headers:
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    details = getattr(e, "details", None)  # APIError body: {"error": {"details": [{"retryDelay": "37s", ...}]}}
+    if isinstance(details, dict):
+        for d in (details.get("error") or {}).get("details") or []:
+            delay = d.get("retryDelay") if isinstance(d, dict) else None
+            if isinstance(delay, str) and delay.endswith("s"):
+                try:
+                    return float(delay[:-1])
+                except ValueError:
+                    pass
+    return None
+
+
+def _next_backoff(prev: float, e: Exception) -> float:
+    """
+    Delay before the next retry: the server's Retry-After if given, otherwise decorrelated jitter
+    (uniform in [INITIAL_BACKOFF, 3 × prev]) so concurrent calls hitting the same 429 don't retry in lockstep.
+    """
+    server_delay = _retry_after(e)
+    if server_delay is not None:
+        return min(MAX_BACKOFF, max(0.0, server_delay))
+    return min(MAX_BACKOFF, random.uniform(INITIAL_BACKOFF, prev * 3))
+
+
+@functools.lru_cache(maxsize=32)
+def _make_config(
+    system_instruction: str | None,
+    temperature: float,
+    max_output_tokens: int,
+    response_schema: type[BaseModel] | None,
+) -> types.GenerateContentConfig:
+    """
+    Build the request config; with response_schema the model runs in schema-constrained JSON mode.
+    Memoized: each agent reuses one validated config instead of rebuilding it per call
+    (configs are never mutated after construction, so sharing is safe).
+    """
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction or None,
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+        response_mime_type="application/json" if response_schema else None,
+        response_schema=response_schema,
+    )
+
+
+def _cache_key(
+    prompt: str,
+    model_name: str,
+    system_instruction: str | None,
+    temperature: float,
+    response_schema: type[BaseModel] | None,
+) -> str:
+    """Response cache key for a request (shared by interactive and batch calls)."""
+    schema_name = response_schema.__name__ if response_schema else None
+    return cache.make_key(model_name, system_instruction, prompt, temperature, schema_name)
+
+
 def generate(
     prompt: str,
     model_name: str,
@@ -78,21 +255,23 @@ def generate(
     system_instruction: str | None = None,
     temperature: float = 0.2,
     max_output_tokens: int = 16384,
+    response_schema: type[BaseModel] | None = None,
+    use_cache: bool = True,
 ) -> str:
     """
     Call Gemini with the given prompt and model. Retries on rate limit/transient errors.
-    Returns the raw text response.
+    Returns the raw text response; identical requests are served from the on-disk cache
+    (use_cache=False skips the lookup, e.g. to retry a reply that failed to parse).
+    Nothing is stored here: callers cache a reply with cache_response() once it has parsed.
+    With response_schema, the model runs in JSON mode constrained to that Pydantic model's schema.
     """
-    key = get_api_key()
-    if not key:
-        raise ValueError("GEMINI_API_KEY not set. Add it to .env or Streamlit secrets.")
+    client = _require_client()
+    config = _make_config(system_instruction, temperature, max_output_tokens, response_schema)
 
-    client = _get_client()
-    config = types.GenerateContentConfig(
-        system_instruction=system_instruction or None,
-        temperature=temperature,
-        max_output_tokens=max_output_tokens,
-    )
+    if use_cache:
+        cached = cache.get(_cache_key(prompt, model_name, system_instruction, temperature, response_schema))
+        if cached is not None:
+            return cached
 
     last_error: Exception | None = None
     backoff = INITIAL_BACKOFF
@@ -111,37 +290,266 @@ def generate(
             last_error = e
             if not _is_retryable(e) or attempt == MAX_RETRIES - 1:
                 raise
+            backoff = _next_backoff(backoff, e)
             time.sleep(backoff)
-            backoff *= 2
 
     if last_error:
         raise last_error
     return ""
 
 
+async def generate_async(
+    prompt: str,
+    model_name: str,
+    *,
+    system_instruction: str | None = None,
+    temperature: float = 0.2,
+    max_output_tokens: int = 16384,
+    response_schema: type[BaseModel] | None = None,
+    use_cache: bool = True,
+) -> str:
+    """
+    Async variant of generate() using the SDK's aio client, so many agent calls can be in flight at once.
+    Each attempt holds the shared semaphore and takes a rate-limit token, keeping fan-out under the
+    API quota. Retries on rate limit/transient errors without blocking the event loop.
+    """
+    client = _require_client()
+    config = _make_config(system_instruction, temperature, max_output_tokens, response_schema)
+
+    cache_key = _cache_key(prompt, model_name, system_instruction, temperature, response_schema)
+    if use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Identical request already on the wire: share its result instead of sending another
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_dispatch_async(client, prompt, model_name, config))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    _waiters[cache_key] = _waiters.get(cache_key, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        # The shield keeps one caller's cancel from failing the others; once nobody is left
+        # waiting, stop the request too (it may still be queued on the semaphore or bucket)
+        if _waiters[cache_key] == 1:
+            task.cancel()
+        raise
+    finally:
+        _waiters[cache_key] -= 1
+        if not _waiters[cache_key]:
+            del _waiters[cache_key]
+
+
+async def _dispatch_async(
+    client: genai.Client,
+    prompt: str,
+    model_name: str,
+    config: types.GenerateContentConfig,
+) -> str:
+    """Send one request with retries (the network half of generate_async)."""
+    last_error: Exception | None = None
+    backoff = INITIAL_BACKOFF
+    sem, bucket = _get_limits()
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            async with sem:
+                if bucket is not None:
+                    await bucket.acquire()
+                response = await client.aio.models.generate_content(
+                    model=model_name,
+                    contents=prompt,
+                    config=config,
+                )
+            if response and getattr(response, "text", None):
+                return response.text.strip()
+            return ""
+        except Exception as e:
+            last_error = e
+            if not _is_retryable(e) or attempt == MAX_RETRIES - 1:
+                raise
+            backoff = _next_backoff(backoff, e)
+            await asyncio.sleep(backoff)
+
+    if last_error:
+        raise last_error
+    return ""
+
+
+def cache_response(
+    prompt: str,
+    model_name: str,
+    text: str,
+    *,
+    system_instruction: str | None = None,
+    temperature: float = 0.2,
+    response_schema: type[BaseModel] | None = None,
+) -> None:
+    """Store a reply that parsed, under the same key generate() looks up; empty replies are not kept."""
+    if text:
+        cache.put(_cache_key(prompt, model_name, system_instruction, temperature, response_schema), text)
+
+
+def generate_stream(
+    prompt: str,
+    model_name: str,
+    *,
+    system_instruction: str | None = None,
+    temperature: float = 0.2,
+    max_output_tokens: int = 16384,
+    response_schema: type[BaseModel] | None = None,
+    use_cache: bool = True,
+) -> Iterator[str]:
+    """
+    Streaming variant of generate(): yields text chunks as the model produces them.
+    A cache hit yields the whole cached response as one chunk. The stream itself is not
+    stored: a cut-off reply looks the same as a finished one, so the caller caches the
+    joined text with cache_response() after it validates.
+    Retries on rate limit/transient errors only until the first chunk has been yielded.
+    """
+    client = _require_client()
+    config = _make_config(system_instruction, temperature, max_output_tokens, response_schema)
+
+    if use_cache:
+        cached = cache.get(_cache_key(prompt, model_name, system_instruction, temperature, response_schema))
+        if cached is not None:
+            yield cached
+            return
+
+    backoff = INITIAL_BACKOFF
+    for attempt in range(MAX_RETRIES):
+        yielded = False
+        try:
+            for chunk in client.models.generate_content_stream(
+                model=model_name,
+                contents=prompt,
+                config=config,
+            ):
+                text = getattr(chunk, "text", None)
+                if text:
+                    yielded = True
+                    yield text
+            break
+        except Exception as e:
+            if yielded or not _is_retryable(e) or attempt == MAX_RETRIES - 1:
+                raise
+            backoff = _next_backoff(backoff, e)
+            time.sleep(backoff)
+
+
+class StreamingArrayItems:
+    """
+    Incrementally pulls complete objects out of the `"<key>": [{...}, {...}]` array of a
+    JSON document that is still arriving (e.g. from generate_stream), so callers can act on
+    each item before the whole response is done. feed() returns the items completed so far.
+    """
+
+    def __init__(self, key: str) -> None:
+        self._key_re = re.compile(r'"' + re.escape(key) + r'"\s*:\s*\[')
+        self._buf = ""
+        self._pos = -1  # scan position inside the array; -1 until the key is found
+        self.done = False
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """Append a chunk; return newly completed array items. Raises ValueError on a malformed item."""
+        self._buf += chunk
+        items: list[dict[str, Any]] = []
+        if self.done:
+            return items
+        if self._pos == -1:
+            match = self._key_re.search(self._buf)
+            if not match:
+                return items
+            self._pos = match.end()
+        buf = self._buf
+        while True:
+            while self._pos < len(buf) and buf[self._pos] in " \t\r\n,":
+                self._pos += 1
+            if self._pos >= len(buf):
+                return items
+            if buf[self._pos] == "]":
+                self.done = True
+                return items
+            if buf[self._pos] != "{":
+                raise ValueError(f"Unexpected {buf[self._pos]!r} in streamed array")
+            end = _find_balanced_object(buf, self._pos)
+            if end == -1:
+                return items  # item still arriving
+            try:
+                items.append(orjson.loads(buf[self._pos : end + 1]))
+            except orjson.JSONDecodeError:
+                raise ValueError("Malformed item in streamed JSON array") from None
+            self._pos = end + 1
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop (started on first use)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="gemini-aio", daemon=True).start()
+    return _loop
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+    """
+    Schedule a coroutine on the shared background loop. Safe to call from any thread
+    (e.g. the Streamlit script thread); returns a concurrent.futures.Future.
+    One long-lived loop keeps the SDK's async HTTP client valid across pipeline runs.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared background loop and block until it returns."""
+    return submit(coro).result()
+
+
+def _find_balanced_object(text: str, start: int) -> int:
+    """
+    Linear scan from the "{" at start; return the index of its matching "}" or -1 if truncated.
+    Braces inside JSON strings (and escaped quotes) are ignored.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
 def extract_json_block(text: str) -> str | None:
-    """Extract a ```json ... ``` block from markdown, or the largest {...} object from text."""
+    """Extract a ```json ... ``` block from markdown, or the first balanced {...} object from text."""
     if not (text or text.strip()):
         return None
     text = text.strip()
     # Prefer explicit JSON code block
-    match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text, re.IGNORECASE)
+    match = _CODE_FENCE.search(text)
     if match:
         return match.group(1).strip()
-    # Find the largest top-level {...} (balance braces in case of nested JSON)
     start = text.find("{")
     if start == -1:
         return None
-    depth = 0
-    end = -1
-    for i in range(start, len(text)):
-        if text[i] == "{":
-            depth += 1
-        elif text[i] == "}":
-            depth -= 1
-            if depth == 0:
-                end = i
-                break
+    end = _find_balanced_object(text, start)
     if end != -1:
         return text[start : end + 1]
     return text[start:]  # truncated; caller may still try to fix
@@ -149,8 +557,8 @@ def extract_json_block(text: str) -> str | None:
 
 def _try_fix_json(blob: str) -> str:
     """Fix trailing commas before } or ]."""
-    blob = re.sub(r",\s*}", "}", blob)
-    blob = re.sub(r",\s*]", "]", blob)
+    blob = _TRAIL_OBJ.sub("}", blob)
+    blob = _TRAIL_ARR.sub("]", blob)
     return blob
 
 
@@ -171,15 +579,155 @@ def generate_json(
         system_instruction=system_instruction,
         max_output_tokens=max_output_tokens,
     )
+    data = _parse_json_response(raw)
+    cache_response(prompt, model_name, raw, system_instruction=system_instruction)
+    return data
+
+
+async def generate_json_async(
+    prompt: str,
+    model_name: str,
+    *,
+    system_instruction: str | None = None,
+    max_output_tokens: int = 16384,
+) -> dict[str, Any]:
+    """Async variant of generate_json(); same extraction and repair rules."""
+    raw = await generate_async(
+        prompt,
+        model_name,
+        system_instruction=system_instruction,
+        max_output_tokens=max_output_tokens,
+    )
+    data = _parse_json_response(raw)
+    cache_response(prompt, model_name, raw, system_instruction=system_instruction)
+    return data
+
+
+def generate_structured(
+    prompt: str,
+    model_name: str,
+    schema: type[M],
+    *,
+    system_instruction: str | None = None,
+    max_output_tokens: int = 16384,
+    use_cache: bool = True,
+) -> M:
+    """
+    Call Gemini with structured output (application/json + response_schema) and validate the
+    response straight into the schema model. No regex extraction or JSON repair is needed.
+    Raises ValueError (pydantic ValidationError) if the response does not match the schema.
+    """
+    raw = generate(
+        prompt,
+        model_name,
+        system_instruction=system_instruction,
+        max_output_tokens=max_output_tokens,
+        response_schema=schema,
+        use_cache=use_cache,
+    )
+    result = schema.model_validate_json(raw)
+    cache_response(prompt, model_name, raw, system_instruction=system_instruction, response_schema=schema)
+    return result
+
+
+async def generate_structured_async(
+    prompt: str,
+    model_name: str,
+    schema: type[M],
+    *,
+    system_instruction: str | None = None,
+    max_output_tokens: int = 16384,
+) -> M:
+    """Async variant of generate_structured()."""
+    raw = await generate_async(
+        prompt,
+        model_name,
+        system_instruction=system_instruction,
+        max_output_tokens=max_output_tokens,
+        response_schema=schema,
+    )
+    result = schema.model_validate_json(raw)
+    cache_response(prompt, model_name, raw, system_instruction=system_instruction, response_schema=schema)
+    return result
+
+
+def generate_model(
+    prompt: str,
+    model_name: str,
+    schema: type[M],
+    *,
+    system_instruction: str | None = None,
+    max_output_tokens: int = 16384,
+) -> M:
+    """
+    Call Gemini (structured output for the schema) and parse the JSON text straight into the
+    schema model in one pydantic-core pass, with no intermediate dict. Unlike generate_structured(),
+    a fenced or prefixed reply is tolerated (the JSON block is extracted and repaired) and null
+    fields fall back to their defaults. A reply that still does not validate is asked for once
+    more, bypassing the cache; the second failure raises ValueError.
+    """
+    def ask(use_cache: bool) -> str:
+        return generate(
+            prompt,
+            model_name,
+            system_instruction=system_instruction,
+            max_output_tokens=max_output_tokens,
+            response_schema=schema,
+            use_cache=use_cache,
+        )
+
+    raw = ask(True)
+    try:
+        result = _parse_model(raw, schema)
+    except ValueError:
+        raw = ask(False)
+        result = _parse_model(raw, schema)
+    cache_response(prompt, model_name, raw, system_instruction=system_instruction, response_schema=schema)
+    return result
+
+
+def _drop_nulls(data: Any) -> Any:
+    """Remove null object members and list items, so the schema's field defaults apply instead."""
+    if isinstance(data, dict):
+        return {k: _drop_nulls(v) for k, v in data.items() if v is not None}
+    if isinstance(data, list):
+        return [_drop_nulls(v) for v in data if v is not None]
+    return data
+
+
+def _parse_model(raw: str, schema: type[M]) -> M:
+    """Validate a reply into schema (see generate_model). Raises ValueError when it cannot."""
+    try:
+        return schema.model_validate_json(raw)
+    except ValidationError as e:
+        # Well-formed JSON with a bad field: only nulls are repaired here, not the JSON text
+        if not any(err["type"] == "json_invalid" for err in e.errors()):
+            return schema.model_validate(_drop_nulls(orjson.loads(raw)))
+    blob = extract_json_block(raw)
+    if not blob:
+        raise ValueError("No JSON found in model response")
+    return schema.model_validate(_drop_nulls(orjson.loads(_try_fix_json(blob))))
+
+
+def _parse_json_response(raw: str) -> dict[str, Any]:
+    """Extract and parse the JSON object from a raw model response (with light repair)."""
+    # Fast path: clean JSON (the common case) needs no extraction scan
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        pass
+    else:
+        if isinstance(data, dict):
+            return data
     blob = extract_json_block(raw)
     if not blob:
         raise ValueError("No JSON found in model response")
     for candidate in [blob, _try_fix_json(blob), blob.replace("\n", " ").replace("\r", " ")]:
         try:
-            return json.loads(candidate)
-        except json.JSONDecodeError:
+            return orjson.loads(candidate)
+        except orjson.JSONDecodeError:
             continue
     try:
-        return json.loads(_try_fix_json(blob.replace("\n", " ").replace("\r", " ")))
-    except json.JSONDecodeError:
+        return orjson.loads(_try_fix_json(blob.replace("\n", " ").replace("\r", " ")))
+    except orjson.JSONDecodeError:
         raise ValueError("Model returned invalid JSON; could not parse or fix.") from None
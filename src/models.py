@@ -7,7 +7,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # --- Research mode and run config ---
@@ -15,6 +15,9 @@ from pydantic import BaseModel, Field, field_validator
 RESEARCH_MODE_EXPLORATORY = "exploratory"
 RESEARCH_MODE_PROBLEM_DRIVEN = "problem_driven"
 
+# Post-parse data objects never change after construction; updates go through model_copy(update=...).
+_FROZEN = ConfigDict(frozen=True, extra="ignore")
+
 
 # --- Stage 0E: Industry Scoping & Category Taxonomy (Exploratory) ---
 
@@ -93,6 +96,8 @@ class Stage0POutput(BaseModel):
 class Category(BaseModel):
     """Single category from Taxonomy Architect."""
 
+    model_config = _FROZEN
+
     name: str
     description: str = ""
     tam: str = ""  # Total Addressable Market
@@ -106,6 +111,8 @@ class Category(BaseModel):
 class Section1(BaseModel):
     """Section 1: Categories, Market Cap, Trends."""
 
+    model_config = _FROZEN
+
     industry: str = ""
     summary: str = ""
     categories: list[Category] = Field(default_factory=list)
@@ -166,6 +173,8 @@ class SegmentPlayer(BaseModel):
 class Segment(BaseModel):
     """Single segment within a category (Stage 2 extended)."""
 
+    model_config = _FROZEN
+
     name: str
     segment_type: str = ""
     description: str = ""
@@ -200,6 +209,8 @@ class SegmentDeepDiveRow(BaseModel):
 class CategorySegments(BaseModel):
     """Section 2 slice: segments for one category."""
 
+    model_config = _FROZEN
+
     category_name: str
     segments: list[Segment] = Field(default_factory=list)
 
@@ -222,6 +233,8 @@ class PersonaCard(BaseModel):
 class PainPoints(BaseModel):
     """Section 3 slice: user pain points for one segment (Stage 4 extended)."""
 
+    model_config = _FROZEN
+
     category_name: str = ""
     segment_name: str = ""
     zero_moment_of_truth: str = ""
@@ -236,6 +249,12 @@ class PainPoints(BaseModel):
     customer_journey_summary: str = ""  # trigger → search → trial → adoption → churn (textual)
 
 
+class PainPointsBatch(BaseModel):
+    """Batched Section 3 response: one PainPoints per segment of a category."""
+
+    results: list[PainPoints] = Field(default_factory=list)
+
+
 # --- Section 4: Competition (Agent 4) — Stage 3 Competitive Landscape ---
 
 
@@ -254,6 +273,8 @@ class BattleCard(BaseModel):
 class CompetitionGaps(BaseModel):
     """Section 4 slice: competition and gaps for one segment (Stage 3 extended)."""
 
+    model_config = _FROZEN
+
     category_name: str = ""
     segment_name: str = ""
     delivery_mechanisms: list[str] = Field(default_factory=list)
@@ -270,6 +291,12 @@ class CompetitionGaps(BaseModel):
     battle_cards: list[BattleCard] = Field(default_factory=list)
 
 
+class CompetitionGapsBatch(BaseModel):
+    """Batched Section 4 response: one CompetitionGaps per segment of a category."""
+
+    results: list[CompetitionGaps] = Field(default_factory=list)
+
+
 # --- Stage 5: Positioning & Competitive Edge (Problem-Driven only) ---
 
 
@@ -323,6 +350,8 @@ def _ensure_str_list(v: Any) -> list[str]:
     if v is None:
         return []
     if isinstance(v, list):
+        if all(isinstance(x, str) for x in v):
+            return list(v)  # already clean (the usual case): a shallow copy, so the result never aliases the input
         return [str(x) for x in v]
     if isinstance(v, str):
         return [v] if v.strip() else []
@@ -332,16 +361,13 @@ def _ensure_str_list(v: Any) -> list[str]:
 class SegmentVerdict(BaseModel):
     """Verdict for one segment (green/amber/red)."""
 
+    model_config = _FROZEN
+
     category_name: str = ""
     segment_name: str = ""
     verdict: str = ""  # green | amber | red
     rationale: str = ""
 
-    @field_validator("category_name", "segment_name", "verdict", "rationale", mode="before")
-    @classmethod
-    def _str_fields(cls, v: Any) -> str:
-        return _coerce_str(v)
-
 
 class AttractivenessRow(BaseModel):
     """One row in segment attractiveness scoring table (Stage 6)."""
@@ -366,9 +392,22 @@ class ScenarioAnalysis(BaseModel):
     assumptions_note: str = ""
 
 
+# --- Stage 7: Deliverables — McKinsey-style slide outline ---
+
+
+class SlideOutlineItem(BaseModel):
+    """One slide in the deck outline."""
+
+    slide_number: int = 0
+    title: str = ""
+    bullets: list[str] = Field(default_factory=list)
+
+
 class JuryOutput(BaseModel):
     """Decision Jury / Stage 6 Synthesis structured output."""
 
+    model_config = _FROZEN
+
     conflict_check: str = ""
     moat_assessment: str = ""
     resource_allocation: str = ""
@@ -380,26 +419,27 @@ class JuryOutput(BaseModel):
     scenario_analysis: ScenarioAnalysis | None = None
     strategic_recommendations: list[str] = Field(default_factory=list)
     next_steps: list[str] = Field(default_factory=list)
-    slide_outline: list[dict[str, Any]] = Field(default_factory=list)  # [{slide_number, title, bullets}]
-
-    @field_validator("conflict_check", "moat_assessment", "resource_allocation", "executive_summary", "synthesis_type", "opportunity_heat_map_summary", mode="before")
-    @classmethod
-    def _str_fields(cls, v: Any) -> str:
-        return _coerce_str(v)
+    slide_outline: list[SlideOutlineItem] = Field(default_factory=list)
 
 
-# --- Stage 7: Deliverables — McKinsey-style slide outline ---
-
+# --- Research Artifact (full state) ---
 
-class SlideOutlineItem(BaseModel):
-    """One slide in the deck outline."""
-
-    slide_number: int = 0
-    title: str = ""
-    bullets: list[str] = Field(default_factory=list)
 
+class Artifact(BaseModel):
+    """Typed view of the full Research Artifact (same keys and order as the orchestrator's dict)."""
 
-# --- Research Artifact (full state) ---
+    mode: str = RESEARCH_MODE_EXPLORATORY
+    industry: str = ""
+    stage0e: Stage0EOutput | None = None
+    stage0p: Stage0POutput | None = None
+    stage1: Stage1Output | None = None
+    section1: Section1 | None = None
+    section2: list[CategorySegments] = Field(default_factory=list)
+    section3: list[PainPoints] = Field(default_factory=list)
+    section4: list[CompetitionGaps] = Field(default_factory=list)
+    stage5: Stage5Output | None = None
+    jury: JuryOutput | None = None
+    convergence_choice: str | None = None
 
 
 def research_artifact_schema() -> dict[str, Any]:
@@ -5,35 +5,36 @@ Problem-Driven: Stage 0P → Taxonomy → Stage 1 → Stage 2 → Stage 3 → St
 """
 from __future__ import annotations
 
-import json
+import concurrent.futures
+from collections.abc import Coroutine
 from pathlib import Path
-from typing import Any, Callable
-
-from src.agents.behavioral_ethologist import run as run_behavioral
-from src.agents.competitive_strategist import run as run_competitive
-from src.agents.decision_jury import run as run_jury
-from src.agents.industry_scoper import run as run_industry_scoper
-from src.agents.market_sizing_agent import run_exploratory as run_sizing_exploratory
-from src.agents.market_sizing_agent import run_problem_driven as run_sizing_problem_driven
-from src.agents.positioning_agent import run as run_positioning
-from src.agents.problem_scoper import run as run_problem_scoper
-from src.agents.segment_specialist import run as run_segment_specialist
-from src.agents.taxonomy_architect import run as run_taxonomy
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+from src.agents._cache import cached, cached_async
+from src.config import EXECUTION_MODE_BATCH, get_execution_mode
+from src.gemini_client import submit
 from src.models import (
     RESEARCH_MODE_EXPLORATORY,
     RESEARCH_MODE_PROBLEM_DRIVEN,
+    Artifact,
     Category,
     CategorySegments,
     CompetitionGaps,
     PainPoints,
     Section1,
+    Segment,
+    SegmentVerdict,
     Stage0EOutput,
-    Stage0POutput,
 )
 
 
 ProgressCallback = Callable[[str, float, int | None], None]
 
+T = TypeVar("T")
+
 # Stage labels for UI (exploratory and problem-driven share most)
 AGENT_LABELS = [
     "Stage 0E/0P (Scoping)",
@@ -51,13 +52,114 @@ def _default_progress(_msg: str, _p: float, _completed: int | None = None) -> No
     pass
 
 
+def _run_concurrently(
+    coros: Iterable[Coroutine[Any, Any, T]],
+    on_done: Callable[[int, int], None] | None = None,
+    on_item: Callable[[T], None] | None = None,
+) -> list[T]:
+    """
+    Run independent agent calls concurrently on the shared loop; results keep input order.
+    on_item(result) and then on_done(completed, total) are called on the caller's thread as
+    each call finishes, so results can be checkpointed and progress can advance per item
+    (Streamlit widgets must be updated from the script thread).
+    The first failure (or an interrupt of the caller) cancels the calls still queued or in
+    flight, so a dead stage does not keep spending quota in the background.
+    """
+    futures = {submit(c): i for i, c in enumerate(coros)}
+    results: list[Any] = [None] * len(futures)
+    try:
+        for n, fut in enumerate(concurrent.futures.as_completed(futures), 1):
+            result = results[futures[fut]] = fut.result()
+            if on_item:
+                on_item(result)
+            if on_done:
+                on_done(n, len(futures))
+    except BaseException:
+        for fut in futures:
+            fut.cancel()
+        raise
+    return results
+
+
+def _unique_by(items: list[T], key: Callable[[T], Hashable]) -> tuple[list[T], list[int]]:
+    """
+    Distinct items by key (first occurrence kept) and, for each input item, its index in that
+    list. Lets a stage run identical inputs once and hand the same result to every duplicate.
+    """
+    index: dict[Hashable, int] = {}
+    unique: list[T] = []
+    slots: list[int] = []
+    for item in items:
+        k = key(item)
+        if k not in index:
+            index[k] = len(unique)
+            unique.append(item)
+        slots.append(index[k])
+    return unique, slots
+
+
+async def _pain_then_gaps(
+    category_name: str, segments: list[Segment]
+) -> tuple[list[PainPoints], list[CompetitionGaps]]:
+    """Stage 3 then Stage 4 for one category; Stage 4 only needs this category's pain points."""
+    from src.agents.behavioral_ethologist import run_batch_async as run_behavioral_batch_async
+    from src.agents.competitive_strategist import run_batch_async as run_competitive_batch_async
+
+    pains = await cached_async(
+        "behavioral_ethologist",
+        {"category": category_name, "segments": segments},
+        run_behavioral_batch_async,
+        category_name=category_name,
+        segments=segments,
+    )
+    gaps = await cached_async(
+        "competitive_strategist", {"pain_points": pains}, run_competitive_batch_async, pain_points_list=pains
+    )
+    return pains, gaps
+
+
+def _dump(model: BaseModel) -> dict[str, Any]:
+    """Artifact dict for a stage model. Unset optionals are left out; readers use .get()."""
+    return model.model_dump(exclude_none=True)
+
+
+# Sections checkpointed item by item while their stage runs (see _checkpoint)
+_CHECKPOINT_SECTIONS = ("section2", "section3", "section4")
+
+
+def _checkpoint_path(output_path: str | Path, section: str) -> Path:
+    return Path(output_path).with_suffix(f".{section}.jsonl")
+
+
+def _clear_checkpoints(output_path: str | Path | None) -> None:
+    if not output_path:
+        return
+    for section in _CHECKPOINT_SECTIONS:
+        _checkpoint_path(output_path, section).unlink(missing_ok=True)
+
+
 def _save_artifact(artifact: dict[str, Any], output_path: str | Path | None) -> None:
+    """Write the final artifact; the per-item checkpoints are then redundant and removed."""
     if not output_path:
         return
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(artifact, f, indent=2, ensure_ascii=False)
+    path.write_bytes(orjson.dumps(artifact, option=orjson.OPT_INDENT_2))
+    _clear_checkpoints(path)
+
+
+def _checkpoint(items: Iterable[BaseModel], output_path: str | Path | None, section: str) -> None:
+    """
+    Append finished items as JSON lines next to the artifact (e.g. artifact.section3.jsonl),
+    in completion order, so a run that dies mid-stage keeps the work already done on disk.
+    """
+    if not output_path:
+        return
+    path = _checkpoint_path(output_path, section)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as f:
+        for item in items:
+            f.write(orjson.dumps(_dump(item), option=orjson.OPT_APPEND_NEWLINE))
 
 
 def _build_section1_from_exploratory(
@@ -110,14 +212,26 @@ def run_pipeline(
     # Convergence (exploratory → problem-driven after Stage 4; optional)
     converge_to_problem: bool = False,
     converge_problem_statement: str = "",
+    execution_mode: str | None = None,
+    on_jury_verdict: Callable[[SegmentVerdict], None] | None = None,
+    on_jury_reset: Callable[[], None] | None = None,
 ) -> dict[str, Any]:
     """
     Run the Unified Dual-Mode pipeline. Returns the Research Artifact (dict).
     mode: "exploratory" | "problem_driven"
     use_deep_research: If True, use Gemini Deep Research Agent for Stage 0E (and future stages) for web-backed insights.
+    execution_mode: "sync" | "batch" (default from config). In batch mode Taxonomy and Stages 2–4 are sent as
+    one Gemini Batch Mode job per layer (cheaper, not rate limited, but minutes-to-hours latency).
+    on_jury_verdict: Called with each segment verdict as the Decision Jury response streams in.
+    on_jury_reset: Called when the Jury retries; verdicts streamed so far are void and will be re-sent.
     """
+    # Agent modules are imported where their stage runs, so importing the orchestrator (e.g. for
+    # AGENT_LABELS at app start) stays cheap and each mode loads only the agents it uses.
+    from src.agents.decision_jury import run as run_jury
+
     report = _default_progress if progress is None else progress
     progress_dr = (lambda msg, p: report(msg, p, None)) if progress else None
+    use_batch = (execution_mode or get_execution_mode()) == EXECUTION_MODE_BATCH
     artifact: dict[str, Any] = {
         "mode": mode,
         "industry": industry,
@@ -132,71 +246,102 @@ def run_pipeline(
         "jury": None,
         "convergence_choice": None,
     }
+    # Typed twin of the artifact for the jury: holds the agents' models as-is, so the
+    # dicts above are dumped once and never re-validated back into models.
+    typed = Artifact(mode=mode, industry=industry)
+    _clear_checkpoints(output_path)  # checkpoints append; drop any left by an earlier run
 
     if mode == RESEARCH_MODE_EXPLORATORY:
+        from src.agents.industry_scoper import run as run_industry_scoper
+        from src.agents.market_sizing_agent import run_exploratory as run_sizing_exploratory
+
         # --- Stage 0E: Industry Scoper ---
         report("Stage 0E — Industry Scoping…" + (" (Deep Research, may take several minutes)" if use_deep_research else ""), 0.02, None)
-        stage0e = run_industry_scoper(
+        stage0e = cached(
+            "industry_scoper",
+            {"industry": industry, "hint": industry_boundaries_hint, "deep_research": use_deep_research},
+            run_industry_scoper,
             industry,
             industry_boundaries_hint=industry_boundaries_hint,
             use_deep_research=use_deep_research,
             progress_callback=progress_dr,
         )
-        artifact["stage0e"] = stage0e.model_dump()
-        artifact["industry"] = stage0e.industry
+        artifact["stage0e"] = _dump(stage0e)
+        artifact["industry"] = typed.industry = stage0e.industry
+        typed.stage0e = stage0e
         report("Stage 0E — Completed", 0.08, 0)
 
         # --- Stage 1: Market Sizing (Exploratory) ---
         report("Stage 1 — Market Sizing (exploratory)…", 0.10, None)
-        categories_for_sizing = [c.model_dump() for c in stage0e.categories]
-        stage1 = run_sizing_exploratory(
-            industry=stage0e.industry,
-            context=stage0e.summary,
-            categories=categories_for_sizing,
-        )
-        artifact["stage1"] = stage1.model_dump()
+        sizing_inputs = {
+            "industry": stage0e.industry,
+            "context": stage0e.summary,
+            "categories": artifact["stage0e"]["categories"],
+        }
+        stage1 = cached("market_sizing", {"mode": mode, **sizing_inputs}, run_sizing_exploratory, **sizing_inputs)
+        artifact["stage1"] = _dump(stage1)
+        typed.stage1 = stage1
         report("Stage 1 — Completed", 0.18, 1)
 
         # Build section1 from 0E + stage1 for rest of pipeline
         section1 = _build_section1_from_exploratory(stage0e, stage1.category_sizing_matrix)
-        artifact["section1"] = section1.model_dump()
+        artifact["section1"] = _dump(section1)
+        typed.section1 = section1
         categories = section1.categories
         report("Categories (from taxonomy) ready.", 0.18, 2)
     else:
+        from src.agents.market_sizing_agent import run_problem_driven as run_sizing_problem_driven
+        from src.agents.problem_scoper import run as run_problem_scoper
+        from src.agents.taxonomy_architect import run as run_taxonomy
+        from src.agents.taxonomy_architect import run_batch_job as run_taxonomy_batch_job
+
         # --- Stage 0P: Problem Scoper ---
         report("Stage 0P — Problem Scoping…", 0.02, None)
-        stage0p = run_problem_scoper(
-            industry=industry,
-            problem_statement=problem_statement,
-            target_user=target_user,
-            target_segment=target_segment,
-            market_money=market_money,
-            user_behavior=user_behavior,
-            competition=competition,
-            ai_advantage=ai_advantage,
-            hypotheses=hypotheses or [],
-        )
-        artifact["stage0p"] = stage0p.model_dump()
+        scoping_inputs = {
+            "industry": industry,
+            "problem_statement": problem_statement,
+            "target_user": target_user,
+            "target_segment": target_segment,
+            "market_money": market_money,
+            "user_behavior": user_behavior,
+            "competition": competition,
+            "ai_advantage": ai_advantage,
+            "hypotheses": hypotheses or [],
+        }
+        stage0p = cached("problem_scoper", scoping_inputs, run_problem_scoper, **scoping_inputs)
+        artifact["stage0p"] = _dump(stage0p)
+        typed.stage0p = stage0p
         report("Stage 0P — Completed", 0.08, 0)
 
         # --- Taxonomy (Section 1) ---
         report("Taxonomy Architect — Running…", 0.10, None)
-        section1 = run_taxonomy(industry)
-        artifact["section1"] = section1.model_dump()
-        artifact["industry"] = section1.industry
+        if use_batch:
+            section1 = cached(
+                "taxonomy",
+                {"industry": industry},
+                run_taxonomy_batch_job,
+                industry,
+                progress_callback=lambda msg: report(msg, 0.10, None),
+            )
+        else:
+            section1 = cached("taxonomy", {"industry": industry}, run_taxonomy, industry)
+        artifact["section1"] = _dump(section1)
+        artifact["industry"] = typed.industry = section1.industry
+        typed.section1 = section1
         report("Taxonomy — Completed", 0.18, 2)
 
         # --- Stage 1: Market Sizing (Problem-Driven) ---
         report("Stage 1 — Market Sizing (problem-driven)…", 0.20, None)
-        stage0p_obj = Stage0POutput(**artifact["stage0p"])
-        stage1 = run_sizing_problem_driven(
-            industry=industry,
-            problem_summary=stage0p_obj.summary or stage0p_obj.problem_statement,
-            target_user=stage0p_obj.target_user,
-            target_segment=stage0p_obj.target_segment,
-            categories=section1.model_dump().get("categories") or [],
-        )
-        artifact["stage1"] = stage1.model_dump()
+        sizing_inputs = {
+            "industry": industry,
+            "problem_summary": stage0p.summary or stage0p.problem_statement,
+            "target_user": stage0p.target_user,
+            "target_segment": stage0p.target_segment,
+            "categories": artifact["section1"]["categories"],
+        }
+        stage1 = cached("market_sizing", {"mode": mode, **sizing_inputs}, run_sizing_problem_driven, **sizing_inputs)
+        artifact["stage1"] = _dump(stage1)
+        typed.stage1 = stage1
         report("Stage 1 — Completed", 0.28, 1)
         categories = section1.categories
     # --- End of mode-specific start; from here both paths use section1 + categories ---
@@ -205,73 +350,132 @@ def run_pipeline(
         categories = categories[:max_categories]
     if not categories:
         report("No categories; running synthesis on partial artifact.", 0.90, None)
-        artifact["jury"] = run_jury(artifact).model_dump()
+        artifact["jury"] = _dump(run_jury(typed, on_verdict=on_jury_verdict, on_reset=on_jury_reset))
         _save_artifact(artifact, output_path)
         report("Done.", 1.0, 7)
         return artifact
 
-    # --- Stage 2: Segment Specialist (per category) ---
-    section2_list: list[CategorySegments] = []
-    total_cats = len(categories)
+    # --- Stage 2: Segment Specialist (all categories concurrently) ---
     summary = (artifact.get("section1") or {}).get("summary") or f"Industry: {artifact.get('industry')}"
-    for i, cat in enumerate(categories):
-        report(f"Segment Specialist — {cat.name} ({i + 1}/{total_cats})…", 0.28 + 0.12 * (i / max(1, total_cats)), None)
-        cat_segments = run_segment_specialist(
-            category_name=cat.name,
-            industry_summary=summary,
-            category_context=cat.description or "; ".join(cat.trends),
+    # A category repeated by the taxonomy (same name and context) is only sent once
+    cat_inputs, cat_slots = _unique_by(
+        [(cat.name, cat.description or "; ".join(cat.trends)) for cat in categories], lambda x: x
+    )
+    total_cats = len(cat_inputs)
+    report(f"Segment Specialist — {total_cats} categories…", 0.28, None)
+    if use_batch:
+        from src.agents.segment_specialist import run_batch_job as run_segment_specialist_batch_job
+
+        unique_section2: list[CategorySegments] = run_segment_specialist_batch_job(
+            [(name, summary, context) for name, context in cat_inputs],
+            progress_callback=lambda msg: report(msg, 0.28, None),
         )
-        section2_list.append(cat_segments)
-        artifact["section2"] = [s.model_dump() for s in section2_list]
+        _checkpoint(unique_section2, output_path, "section2")
+    else:
+        from src.agents.segment_specialist import run_async as run_segment_specialist_async
+
+        step = 0.17 / total_cats  # Stage 2 spans 0.28 → 0.45
+        unique_section2 = _run_concurrently(
+            (
+                cached_async(
+                    "segment_specialist",
+                    {"category": name, "summary": summary, "context": context},
+                    run_segment_specialist_async,
+                    category_name=name,
+                    industry_summary=summary,
+                    category_context=context,
+                )
+                for name, context in cat_inputs
+            ),
+            on_done=lambda n, total: report(f"Segment Specialist — {n}/{total} categories…", 0.28 + step * n, None),
+            on_item=lambda cs: _checkpoint([cs], output_path, "section2"),
+        )
+    section2_list = [unique_section2[i] for i in cat_slots]
+    artifact["section2"] = [_dump(s) for s in section2_list]
+    typed.section2 = section2_list
 
     report("Segment Specialist — Completed", 0.45, 3)
 
-    segment_tasks: list[tuple[str, str, str]] = []
+    # Segments grouped per category: Stage 3/4 send one row-marshaled call per category.
+    category_batches: list[tuple[str, list[Segment]]] = []
     for cs in section2_list:
         segs = cs.segments
         if max_segments_per_category is not None:
             segs = segs[: max_segments_per_category]
-        for seg in segs:
-            segment_tasks.append((cs.category_name, seg.name, seg.description or seg.notes))
+        if segs:
+            category_batches.append((cs.category_name, segs))
 
-    if not segment_tasks:
+    if not category_batches:
         report("No segments; running synthesis.", 0.90, None)
-        artifact["jury"] = run_jury(artifact).model_dump()
+        artifact["jury"] = _dump(run_jury(typed, on_verdict=on_jury_verdict, on_reset=on_jury_reset))
         _save_artifact(artifact, output_path)
         report("Done.", 1.0, 7)
         return artifact
 
-    # --- Stage 3 (Pain) & Stage 4 (Competition) per segment ---
-    total_tasks = len(segment_tasks)
-    section3_list: list[PainPoints] = []
-    for idx, (cat_name, seg_name, seg_ctx) in enumerate(segment_tasks):
-        report(f"Behavioral Ethologist — {cat_name} / {seg_name}…", 0.45 + 0.20 * (idx / max(1, total_tasks)), None)
-        pp = run_behavioral(category_name=cat_name, segment_name=seg_name, segment_context=seg_ctx)
-        section3_list.append(pp)
-        artifact["section3"] = [p.model_dump() for p in section3_list]
+    # --- Stage 3 (Pain) & Stage 4 (Competition): one batch per category, categories concurrently ---
+    # Identical (category, segments) batches run once; Stage 4 inputs then follow from Stage 3
+    unique_batches, batch_slots = _unique_by(
+        category_batches, lambda b: (b[0], tuple(seg.model_dump_json() for seg in b[1]))
+    )
+    total_tasks = sum(len(segs) for _, segs in unique_batches)
+    if use_batch:
+        from src.agents.behavioral_ethologist import run_batch_job as run_behavioral_batch_job
+        from src.agents.competitive_strategist import run_batch_job as run_competitive_batch_job
 
-    report("Behavioral Ethologist — Completed", 0.68, 4)
+        # Each Batch Mode job is one layer, so Stage 4 waits for the whole Stage 3 job
+        report(f"Behavioral Ethologist — {total_tasks} segments…", 0.45, None)
+        pain_batches: list[list[PainPoints]] = run_behavioral_batch_job(
+            unique_batches, progress_callback=lambda msg: report(msg, 0.45, None)
+        )
+        _checkpoint((pp for pains in pain_batches for pp in pains), output_path, "section3")
+        report("Behavioral Ethologist — Completed", 0.68, 4)
+        report(f"Competitive Strategist — {total_tasks} segments…", 0.68, None)
+        gap_batches: list[list[CompetitionGaps]] = run_competitive_batch_job(
+            pain_batches, progress_callback=lambda msg: report(msg, 0.68, None)
+        )
+        _checkpoint((cg for gaps in gap_batches for cg in gaps), output_path, "section4")
+    else:
+        # Stage 4 for a category starts as soon as its Stage 3 batch lands, not after all of Stage 3
+        report(f"Behavioral Ethologist → Competitive Strategist — {total_tasks} segments…", 0.45, None)
+        step = 0.37 / len(unique_batches)  # Stages 3+4 span 0.45 → 0.82
 
-    section4_list: list[CompetitionGaps] = []
-    for idx, pp in enumerate(section3_list):
-        report(f"Competitive Strategist — {pp.category_name} / {pp.segment_name}…", 0.68 + 0.12 * (idx / max(1, total_tasks)), None)
-        cg = run_competitive(pain_points=pp)
-        section4_list.append(cg)
-        artifact["section4"] = [c.model_dump() for c in section4_list]
+        def checkpoint_category(pains_gaps: tuple[list[PainPoints], list[CompetitionGaps]]) -> None:
+            _checkpoint(pains_gaps[0], output_path, "section3")
+            _checkpoint(pains_gaps[1], output_path, "section4")
+
+        stage34 = _run_concurrently(
+            (_pain_then_gaps(cat_name, segs) for cat_name, segs in unique_batches),
+            on_done=lambda n, total: report(
+                f"Behavioral Ethologist → Competitive Strategist — {n}/{total} categories…", 0.45 + step * n, None
+            ),
+            on_item=checkpoint_category,
+        )
+        pain_batches = [pains for pains, _ in stage34]
+        gap_batches = [gaps for _, gaps in stage34]
+        report("Behavioral Ethologist — Completed", 0.82, 4)
+    section3_list = [pp for i in batch_slots for pp in pain_batches[i]]
+    artifact["section3"] = [_dump(p) for p in section3_list]
+    section4_list = [cg for i in batch_slots for cg in gap_batches[i]]
+    artifact["section4"] = [_dump(c) for c in section4_list]
+    typed.section3 = section3_list
+    typed.section4 = section4_list
 
     report("Competitive Strategist — Completed", 0.82, 5)
 
     # --- Stage 5: Positioning (Problem-Driven only) ---
     if mode == RESEARCH_MODE_PROBLEM_DRIVEN:
+        from src.agents.positioning_agent import run as run_positioning
+
         report("Stage 5 — Positioning…", 0.84, None)
-        stage5 = run_positioning(artifact)
-        artifact["stage5"] = stage5.model_dump()
+        stage5 = cached("positioning", {"artifact": artifact}, run_positioning, artifact)
+        artifact["stage5"] = _dump(stage5)
+        typed.stage5 = stage5
         report("Stage 5 — Completed", 0.88, 6)
 
     # --- Stage 6: Synthesis / Decision Jury ---
     report("Stage 6 — Synthesis / Jury…", 0.88, None)
-    jury_output = run_jury(artifact)
-    artifact["jury"] = jury_output.model_dump()
+    jury_output = run_jury(typed, on_verdict=on_jury_verdict, on_reset=on_jury_reset)
+    artifact["jury"] = _dump(jury_output)
     _save_artifact(artifact, output_path)
     report("Pipeline complete.", 1.0, 7)
     return artifact
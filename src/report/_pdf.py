@@ -0,0 +1,415 @@
+"""
+PDF half of the report builder (ReportLab). Imported by builder.build_pdf on first use, so
+HTML-only callers never load ReportLab.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+from src.report.builder import _ensure_str_list, _jury_str, _verdict_rows
+
+# One C-level pass per string instead of chained str.replace calls
+_ESC_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+def _esc(s: str) -> str:
+    """Escape for use inside ReportLab Paragraphs."""
+    return (s or "").translate(_ESC_TABLE)
+
+
+# Brick Red, Blue & White palette
+BRICK_RED = colors.HexColor("#B22222")
+NAVY_BLUE = colors.HexColor("#1E3A5F")
+LIGHT_BLUE_BG = colors.HexColor("#F0F4F8")
+WHITE = colors.white
+
+# Stylesheet and paragraph styles are built once per process, not per report
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    name="ReportTitle",
+    parent=_STYLES["Heading1"],
+    fontSize=20,
+    spaceAfter=6,
+    spaceBefore=0,
+    textColor=NAVY_BLUE,
+)
+_H2_STYLE = ParagraphStyle(
+    name="SectionHeading",
+    parent=_STYLES["Heading2"],
+    fontSize=14,
+    spaceBefore=14,
+    spaceAfter=8,
+    textColor=BRICK_RED,
+)
+_H3_STYLE = ParagraphStyle(
+    name="SubHeading",
+    parent=_STYLES["Heading3"],
+    fontSize=11,
+    spaceBefore=10,
+    spaceAfter=4,
+    textColor=NAVY_BLUE,
+)
+_BODY_STYLE = ParagraphStyle(
+    name="Body",
+    parent=_STYLES["Normal"],
+    fontSize=10,
+    spaceAfter=6,
+    leading=13,
+)
+# Table cell style: smaller font, word wrap via Paragraph
+_CELL_STYLE = ParagraphStyle(
+    name="TableCell",
+    parent=_STYLES["Normal"],
+    fontSize=8,
+    leading=10,
+    spaceAfter=0,
+    spaceBefore=0,
+)
+_CELL_HEADER_STYLE = ParagraphStyle(
+    name="TableHeader",
+    parent=_STYLES["Normal"],
+    fontSize=8,
+    leading=10,
+    spaceAfter=0,
+    spaceBefore=0,
+    fontName="Helvetica-Bold",
+    textColor=WHITE,
+)
+
+# Horizontal padding (each side) of the categories table; also used to decide if a cell fits
+_CELL_PAD = 8
+
+
+def _cell(text: str, style: ParagraphStyle, width: float) -> str | Paragraph:
+    """
+    Table cell for text: a plain string when it fits on one line with no markup to escape
+    (drawn directly, no Paragraph layout pass), else a wrapping Paragraph.
+    """
+    text = text or "—"
+    if not any(c in text for c in "&<>\n") and stringWidth(text, style.fontName, style.fontSize) <= width - 2 * _CELL_PAD:
+        return text
+    return Paragraph(_esc(text), style)
+
+
+def build_pdf(artifact: dict[str, Any], out: str | Path | BinaryIO | None = None) -> bytes | None:
+    """
+    Build a multi-page PDF from the research artifact.
+    With out (a path or binary file object) the PDF is written there and None is returned;
+    otherwise the PDF bytes are returned.
+    """
+    buf = BytesIO() if out is None else out
+    doc = SimpleDocTemplate(
+        str(buf) if isinstance(buf, Path) else buf,
+        pagesize=letter,
+        pageCompression=1,  # zlib-compress page content streams (fonts are built-in Helvetica, never embedded)
+        rightMargin=1 * inch,
+        leftMargin=1 * inch,
+        topMargin=1 * inch,
+        bottomMargin=1 * inch,
+    )
+    story = []
+    s1 = artifact.get("section1") or {}
+    jury = artifact.get("jury") or {}
+    industry = artifact.get("industry") or "Market Research"
+    categories = s1.get("categories") or []
+
+    # Title and date
+    story.append(Paragraph(f"Market Research Report: {_esc(industry)}", _TITLE_STYLE))
+    story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", _BODY_STYLE))
+    story.append(Spacer(1, 0.35 * inch))
+
+    # Methodology
+    story.append(Paragraph("Methodology", _H2_STYLE))
+    mode = artifact.get("mode") or "exploratory"
+    mode_label = "Exploratory (industry landscape)" if mode == "exploratory" else "Problem-Driven (idea validation)"
+    story.append(Paragraph(
+        f"This report was produced by the Unified Dual-Mode pipeline ({mode_label}): "
+        "Stage 0E/0P Scoping → Stage 1 Market Sizing → Taxonomy/Segments → Pain Points → Competition → "
+        "Positioning (problem-driven) → Stage 6 Synthesis / Decision Jury.",
+        _BODY_STYLE,
+    ))
+    story.append(Paragraph("Data reflects agent-generated analysis based on the stated industry.", _BODY_STYLE))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Scoping (Stage 0E or 0P)
+    stage0e = artifact.get("stage0e") or {}
+    stage0p = artifact.get("stage0p") or {}
+    if stage0e and (stage0e.get("industry_boundaries") or stage0e.get("industry")):
+        story.append(Paragraph("Industry Scoping (Stage 0E)", _H2_STYLE))
+        if stage0e.get("level1_industry_name"):
+            story.append(Paragraph("<b>Level 1 (Industry):</b> " + _esc(stage0e.get("level1_industry_name")), _BODY_STYLE))
+        story.append(Paragraph(_esc(stage0e.get("industry_boundaries") or ""), _BODY_STYLE))
+        story.append(Paragraph("<b>Value chain:</b> " + _esc(stage0e.get("value_chain_summary") or ""), _BODY_STYLE))
+        if stage0e.get("industry_classification"):
+            story.append(Paragraph("<b>Classification:</b> " + _esc(stage0e.get("industry_classification")), _BODY_STYLE))
+        if stage0e.get("pestel_overview"):
+            story.append(Paragraph("<b>PESTEL:</b> " + _esc(stage0e.get("pestel_overview")[:1500]), _BODY_STYLE))
+        tq = stage0e.get("taxonomy_quantification") or {}
+        if tq:
+            story.append(Paragraph(f"<b>Taxonomy:</b> Categories: {tq.get('categories_count', '—')}; Segments: {tq.get('segments_count', '—')}. {_esc(tq.get('size_orders_summary'))} {_esc(tq.get('growth_signals_summary'))}", _BODY_STYLE))
+        story.append(Spacer(1, 0.2 * inch))
+    if stage0p and stage0p.get("problem_statement"):
+        story.append(Paragraph("Problem Scoping (Stage 0P)", _H2_STYLE))
+        story.append(Paragraph(_esc(stage0p.get("problem_statement") or ""), _BODY_STYLE))
+        story.append(Paragraph("Target user: " + _esc(stage0p.get("target_user") or ""), _BODY_STYLE))
+        story.append(Paragraph("Target segment: " + _esc(stage0p.get("target_segment") or ""), _BODY_STYLE))
+        story.append(Spacer(1, 0.2 * inch))
+
+    # Stage 1 Market Sizing
+    stage1 = artifact.get("stage1") or {}
+    if stage1.get("category_sizing_matrix") or stage1.get("tam_sam_som"):
+        story.append(Paragraph("Market Sizing (Stage 1)", _H2_STYLE))
+        if stage1.get("mode_clarification"):
+            story.append(Paragraph(_esc(stage1.get("mode_clarification")), _BODY_STYLE))
+        if stage1.get("tam_sam_som"):
+            tss = stage1["tam_sam_som"]
+            story.append(Paragraph("TAM: " + _esc(tss.get("tam") or ""), _BODY_STYLE))
+            story.append(Paragraph("SAM: " + _esc(tss.get("sam") or ""), _BODY_STYLE))
+            story.append(Paragraph("SOM: " + _esc(tss.get("som") or ""), _BODY_STYLE))
+        for row in stage1.get("category_sizing_matrix") or []:
+            story.append(Paragraph(
+                f"{_esc(row.get('category_name'))}: {_esc(row.get('market_size'))} | Hist. CAGR {_esc(row.get('historical_cagr'))} | Proj. {_esc(row.get('projected_cagr'))} | Largest: {_esc(row.get('largest_segment_name'))} ({_esc(row.get('largest_segment_size'))})",
+                _BODY_STYLE,
+            ))
+            for d in _ensure_str_list(row.get("growth_drivers")):
+                story.append(Paragraph("  Drivers: " + _esc(d), _BODY_STYLE))
+            for h in _ensure_str_list(row.get("headwinds")):
+                story.append(Paragraph("  Headwinds: " + _esc(h), _BODY_STYLE))
+        story.append(Paragraph(_esc(stage1.get("summary") or ""), _BODY_STYLE))
+        story.append(Spacer(1, 0.2 * inch))
+
+    # Executive Summary — data-rich: industry, category count, key metrics, jury summary
+    story.append(Paragraph("Executive Summary", _H2_STYLE))
+    summary_parts = []
+    summary_parts.append(f"<b>Scope:</b> This report analyzes the <b>{_esc(industry)}</b> market.")
+    if categories:
+        cat_names = ", ".join(_esc(c.get("name") or "") for c in categories[:8])
+        if len(categories) > 8:
+            cat_names += f" (and {len(categories) - 8} more)"
+        summary_parts.append(f" The market is decomposed into <b>{len(categories)}</b> categories: {cat_names}.")
+        # Add one line of high-level numbers if available
+        first = categories[0]
+        tam, som = first.get("tam") or "—", first.get("som") or "—"
+        if tam != "—" or som != "—":
+            summary_parts.append(f" Representative scale (first category): TAM {_esc(tam)}, SOM {_esc(som)}.")
+    summary_parts.append(" " + (s1.get("summary") or "").strip().replace("\n", " ")[:400])
+    if s1.get("summary") and len((s1.get("summary") or "")) > 400:
+        summary_parts.append("…")
+    jury_summary = _jury_str(jury, "executive_summary")
+    if jury_summary:
+        summary_parts.append(" <b>Key verdict:</b> " + _esc(jury_summary[:500]))
+        if len(jury_summary) > 500:
+            summary_parts.append("…")
+    verdict_rows = _verdict_rows(jury)
+    top = next((r for r in verdict_rows if r[2].lower() == "green"), None)
+    if top:
+        summary_parts.append(f" Top recommended segment: <b>{_esc(top[0])} / {_esc(top[1])}</b>.")
+    exec_text = "".join(summary_parts) if summary_parts else "No summary available."
+    story.append(Paragraph(exec_text.replace("\n", "<br/>"), _BODY_STYLE))
+    story.append(Spacer(1, 0.35 * inch))
+
+    # Categories, Market Cap & Trends — table with Paragraph cells so text wraps
+    story.append(Paragraph("Categories, Market Cap &amp; Trends", _H2_STYLE))
+    if categories:
+        # Column widths: give Trends enough space and wrap via Paragraph
+        col_w = [1.0 * inch, 0.85 * inch, 0.85 * inch, 0.65 * inch, 0.65 * inch, 2.5 * inch]
+        header_row = [
+            Paragraph("<b>Category</b>", _CELL_HEADER_STYLE),
+            Paragraph("<b>TAM</b>", _CELL_HEADER_STYLE),
+            Paragraph("<b>SOM</b>", _CELL_HEADER_STYLE),
+            Paragraph("<b>Hist. CAGR</b>", _CELL_HEADER_STYLE),
+            Paragraph("<b>Proj. CAGR</b>", _CELL_HEADER_STYLE),
+            Paragraph("<b>Trends</b>", _CELL_HEADER_STYLE),
+        ]
+        table_data = [header_row]
+        for c in categories:
+            trends_list = c.get("trends") or []
+            table_data.append([
+                _cell(c.get("name"), _CELL_STYLE, col_w[0]),
+                _cell(c.get("tam"), _CELL_STYLE, col_w[1]),
+                _cell(c.get("som"), _CELL_STYLE, col_w[2]),
+                _cell(c.get("historical_cagr"), _CELL_STYLE, col_w[3]),
+                _cell(c.get("projected_cagr"), _CELL_STYLE, col_w[4]),
+                # One markup-free Paragraph per trend (a cell may hold a list of flowables)
+                [Paragraph(_esc(t), _CELL_STYLE) for t in trends_list] if trends_list else "—",
+            ])
+        t = Table(table_data, colWidths=col_w)
+        t.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), NAVY_BLUE),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            # Plain-string cells render with the table font; match _CELL_STYLE
+            ("FONTNAME", (0, 1), (-1, -1), _CELL_STYLE.fontName),
+            ("FONTSIZE", (0, 1), (-1, -1), _CELL_STYLE.fontSize),
+            ("LEADING", (0, 1), (-1, -1), _CELL_STYLE.leading),
+            ("TOPPADDING", (0, 0), (-1, -1), 8),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+            ("LEFTPADDING", (0, 0), (-1, -1), _CELL_PAD),
+            ("RIGHTPADDING", (0, 0), (-1, -1), _CELL_PAD),
+            ("BACKGROUND", (0, 1), (-1, -1), LIGHT_BLUE_BG),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#CBD5E1")),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [WHITE, LIGHT_BLUE_BG]),
+        ]))
+        story.append(t)
+    else:
+        story.append(Paragraph("No category data.", _BODY_STYLE))
+    story.append(Spacer(1, 0.35 * inch))
+
+    # Segmented Decomposition (drivers on new lines when multiple)
+    story.append(Paragraph("Segmented Decomposition", _H2_STYLE))
+    section2 = artifact.get("section2") or []
+    for cs in section2:
+        story.append(Paragraph(_esc(cs.get("category_name") or "Category"), _H3_STYLE))
+        for seg in cs.get("segments") or []:
+            name = _esc(seg.get("name") or "")
+            seg_type = _esc(seg.get("segment_type") or "")
+            drivers_list = seg.get("growth_drivers") or []
+            drivers = "<br/>".join(_esc(d) for d in drivers_list) if drivers_list else "—"
+            story.append(Paragraph(f"• <b>{name}</b> ({seg_type}):<br/>{drivers}", _BODY_STYLE))
+        story.append(Spacer(1, 0.15 * inch))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # User Pain Points & Friction (one paragraph per field, list items on new lines)
+    story.append(Paragraph("User Pain Points &amp; Friction", _H2_STYLE))
+    section3 = artifact.get("section3") or []
+    for pp in section3:
+        seg_title = f"{pp.get('category_name')} / {pp.get('segment_name')}"
+        story.append(Paragraph(_esc(seg_title), _H3_STYLE))
+        zmot = _esc(pp.get("zero_moment_of_truth") or "—")
+        story.append(Paragraph(f"<b>Zero Moment of Truth:</b> {zmot}", _BODY_STYLE))
+        alts = "<br/>".join(_esc(a) for a in _ensure_str_list(pp.get("alternative_paths")))
+        story.append(Paragraph("<b>Alternative paths:</b><br/>" + (alts or "—"), _BODY_STYLE))
+        killers = "<br/>".join(_esc(k) for k in _ensure_str_list(pp.get("retention_killers")))
+        story.append(Paragraph("<b>Retention killers:</b><br/>" + (killers or "—"), _BODY_STYLE))
+        story.append(Spacer(1, 0.15 * inch))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Competition, Delivery & Gaps
+    story.append(Paragraph("Competition, Delivery &amp; Gaps", _H2_STYLE))
+    section4 = artifact.get("section4") or []
+    for cg in section4:
+        seg_title = f"{cg.get('category_name')} / {cg.get('segment_name')}"
+        story.append(Paragraph(_esc(seg_title), _H3_STYLE))
+        story.append(Paragraph("<b>Delivery:</b> " + _esc(", ".join(_ensure_str_list(cg.get("delivery_mechanisms"))) or "—"), _BODY_STYLE))
+        prod_gaps = "<br/>".join(_esc(g) for g in _ensure_str_list(cg.get("product_feature_gaps")))
+        story.append(Paragraph("<b>Product gaps:</b><br/>" + (prod_gaps or "—"), _BODY_STYLE))
+        exp_gaps = "<br/>".join(_esc(g) for g in _ensure_str_list(cg.get("experience_gaps")))
+        story.append(Paragraph("<b>Experience gaps:</b><br/>" + (exp_gaps or "—"), _BODY_STYLE))
+        story.append(Paragraph(f"<b>Moat:</b> {_esc(cg.get('moat_assessment') or '—')}", _BODY_STYLE))
+        story.append(Spacer(1, 0.15 * inch))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Decision Jury — split long text into paragraphs by newline
+    def _para_lines(text: str) -> None:
+        raw = (text or "—").replace("&", "&amp;")
+        for part in raw.split("\n"):
+            part = part.strip()
+            if part:
+                story.append(Paragraph(part, _BODY_STYLE))
+
+    story.append(Paragraph("Decision Jury", _H2_STYLE))
+    story.append(Paragraph("Conflict Check", _H3_STYLE))
+    _para_lines(_jury_str(jury, "conflict_check"))
+    story.append(Spacer(1, 0.15 * inch))
+    story.append(Paragraph("Moat Assessment", _H3_STYLE))
+    _para_lines(_jury_str(jury, "moat_assessment"))
+    story.append(Spacer(1, 0.15 * inch))
+    story.append(Paragraph("Resource Allocation ($1M)", _H3_STYLE))
+    _para_lines(_jury_str(jury, "resource_allocation"))
+    story.append(Spacer(1, 0.15 * inch))
+    story.append(Paragraph("Segment Verdicts", _H3_STYLE))
+    for cat, seg, verdict, rationale in verdict_rows:
+        line = f"{_esc(cat)} / {_esc(seg)}: <b>{_esc(verdict)}</b> — {_esc(rationale)}"
+        story.append(Paragraph(line, _BODY_STYLE))
+    opp_heat = jury.get("opportunity_heat_map_summary")
+    if opp_heat:
+        story.append(Paragraph("Opportunity Heat Map", _H3_STYLE))
+        story.append(Paragraph(_esc(opp_heat), _BODY_STYLE))
+    attr_table = jury.get("segment_attractiveness_table") or []
+    if attr_table:
+        story.append(Paragraph("Segment Attractiveness", _H3_STYLE))
+        col_w = [1.2 * inch, 0.6 * inch, 0.5 * inch, 0.7 * inch, 0.6 * inch, 0.6 * inch, 0.6 * inch]
+        header_row = ["Segment", "Size", "Growth", "Competition", "Access", "Reg. Risk", "Overall"]
+        table_data = [header_row]
+        for r in attr_table:
+            if isinstance(r, dict):
+                table_data.append([
+                    _esc(r.get("segment_name") or ""),
+                    _esc(r.get("size_score") or ""),
+                    _esc(r.get("growth_score") or ""),
+                    _esc(r.get("competition_intensity") or ""),
+                    _esc(r.get("accessibility") or ""),
+                    _esc(r.get("regulatory_risk") or ""),
+                    _esc(r.get("overall_score") or ""),
+                ])
+        if len(table_data) > 1:
+            t = Table(table_data, colWidths=col_w)
+            t.setStyle(TableStyle([
+                ("BACKGROUND", (0, 0), (-1, 0), NAVY_BLUE),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("TEXTCOLOR", (0, 0), (-1, 0), WHITE),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#CBD5E1")),
+            ]))
+            story.append(t)
+    scen = jury.get("scenario_analysis")
+    if scen and isinstance(scen, dict):
+        story.append(Paragraph("Scenario Analysis (Top Segment)", _H3_STYLE))
+        story.append(Paragraph("Segment: " + _esc(scen.get("segment_name")), _BODY_STYLE))
+        story.append(Paragraph("Base: " + _esc(scen.get("base_case")), _BODY_STYLE))
+        story.append(Paragraph("Best: " + _esc(scen.get("best_case")), _BODY_STYLE))
+        story.append(Paragraph("Worst: " + _esc(scen.get("worst_case")), _BODY_STYLE))
+        story.append(Paragraph(_esc(scen.get("assumptions_note") or ""), _BODY_STYLE))
+    for rec in _ensure_str_list(jury.get("strategic_recommendations")):
+        story.append(Paragraph("• " + _esc(rec), _BODY_STYLE))
+    next_steps = _ensure_str_list(jury.get("next_steps"))
+    if next_steps:
+        story.append(Paragraph("Next Steps", _H3_STYLE))
+        for step in next_steps:
+            story.append(Paragraph("• " + _esc(step), _BODY_STYLE))
+    outline = jury.get("slide_outline") or []
+    if outline:
+        story.append(Paragraph("Slide Outline (Stage 7)", _H3_STYLE))
+        for s in outline:
+            if isinstance(s, dict):
+                story.append(Paragraph(f"<b>Slide {s.get('slide_number')}:</b> {_esc(s.get('title'))}", _BODY_STYLE))
+                for b in _ensure_str_list(s.get("bullets")):
+                    story.append(Paragraph("  • " + _esc(b), _BODY_STYLE))
+
+    # Stage 5 Positioning (problem-driven)
+    stage5 = artifact.get("stage5") or {}
+    if artifact.get("mode") == "problem_driven" and stage5:
+        story.append(Spacer(1, 0.3 * inch))
+        story.append(Paragraph("Positioning &amp; GTM (Stage 5)", _H2_STYLE))
+        story.append(Paragraph("Positioning statement: " + _esc(stage5.get("positioning_statement") or ""), _BODY_STYLE))
+        story.append(Paragraph("Competitive advantage: " + _esc(stage5.get("unique_competitive_advantage") or ""), _BODY_STYLE))
+        if stage5.get("perceptual_map_2x2_note"):
+            story.append(Paragraph("Perceptual map: " + _esc(stage5.get("perceptual_map_2x2_note")), _BODY_STYLE))
+        story.append(Paragraph("Pricing: " + _esc(stage5.get("pricing_strategy") or ""), _BODY_STYLE))
+        if stage5.get("price_anchor_per_segment"):
+            story.append(Paragraph("Price anchor: " + _esc(stage5.get("price_anchor_per_segment")), _BODY_STYLE))
+        story.append(Paragraph("Funding: " + _esc(stage5.get("funding_required") or ""), _BODY_STYLE))
+        story.append(Paragraph("GTM: " + _esc(stage5.get("gtm_strategy") or ""), _BODY_STYLE))
+        for b in stage5.get("segment_briefs") or []:
+            if isinstance(b, dict):
+                story.append(Paragraph("<b>Segment brief — " + _esc(b.get("segment_name") or "") + "</b>", _BODY_STYLE))
+                story.append(Paragraph("Problem: " + _esc(b.get("problem_statement") or ""), _BODY_STYLE))
+                story.append(Paragraph("Price anchor: " + _esc(b.get("price_anchor") or ""), _BODY_STYLE))
+
+    doc.build(story)
+    return buf.getvalue() if out is None else None
@@ -2,26 +2,41 @@
 Streamlit UI: Industry input → Run pipeline with progress → View/Download report.
 """
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Add project root so "src" imports work (e.g. when running: streamlit run streamlit_app.py)
-_project_root = Path(__file__).resolve().parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
 import streamlit as st
 
-# Load .env for GEMINI_API_KEY when not in Streamlit secrets
-try:
-    from dotenv import load_dotenv
-    load_dotenv(_project_root / ".env")
-except Exception:
-    pass
 
-from src.models import RESEARCH_MODE_EXPLORATORY, RESEARCH_MODE_PROBLEM_DRIVEN, _coerce_str, _ensure_str_list
+@st.cache_resource
+def _bootstrap() -> Path:
+    """One-time process setup (not per rerun): make "src" importable and load .env."""
+    root = Path(__file__).resolve().parent
+    # Add project root so "src" imports work (e.g. when running: streamlit run streamlit_app.py)
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    # Load .env for GEMINI_API_KEY when not in Streamlit secrets
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(root / ".env")
+    except Exception:
+        pass
+    return root
+
+
+_project_root = _bootstrap()
+
+from src.cache import make_key
+from src.models import RESEARCH_MODE_EXPLORATORY, RESEARCH_MODE_PROBLEM_DRIVEN, SegmentVerdict, _coerce_str, _ensure_str_list
 from src.orchestrator import AGENT_LABELS, run_pipeline
-from src.report.builder import build_html, build_pdf
+
+
+def _join(items: list | None, sep: str = "; ") -> str:
+    """Join an optional artifact list without building an empty placeholder list."""
+    return sep.join(items) if items else ""
 
 
 def _jury_str(jury: dict, key: str) -> str:
@@ -29,104 +44,141 @@ def _jury_str(jury: dict, key: str) -> str:
     return _coerce_str(jury.get(key))
 
 
+@st.cache_resource
+def _get_builders():
+    """(build_html, build_pdf), imported on the first report build rather than at app start."""
+    from src.report.builder import build_html, build_pdf
+
+    return build_html, build_pdf
+
+
+# Reports are rendered once per pipeline result, not on every rerun. The leading underscore
+# tells Streamlit not to hash the artifact; artifact_key (set once per run) identifies it.
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_reports(artifact_key: str, _artifact: dict) -> tuple[bytes, str]:
+    """(PDF bytes, HTML) for the artifact; the two independent builders run side by side."""
+    build_html, build_pdf = _get_builders()
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        pdf = ex.submit(build_pdf, _artifact)
+        html = ex.submit(build_html, _artifact)
+        return pdf.result(), html.result()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _verdict_markdown(artifact_key: str, _jury: dict) -> str:
+    """Segment verdicts as one markdown list; coerced once per artifact."""
+    rows = [
+        (
+            _coerce_str(v.get("category_name")),
+            _coerce_str(v.get("segment_name")),
+            _coerce_str(v.get("verdict")),
+            _coerce_str(v.get("rationale")),
+        )
+        for v in _jury.get("segment_verdicts") or []
+        if isinstance(v, dict)
+    ]
+    return "\n".join(f"- {cat} / {seg}: **{verdict}** — {rationale}" for cat, seg, verdict, rationale in rows)
+
+
+@st.cache_resource
+def _load_css() -> str:
+    return (_project_root / "static" / "app.css").read_text(encoding="utf-8")
+
+
+class PipelineCancelled(Exception):
+    """Raised from the progress callback to unwind a run the user cancelled."""
+
+
+@st.cache_resource
+def _pipeline_pool() -> ThreadPoolExecutor:
+    """Process-wide worker threads for pipeline runs (one run per session at a time)."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipeline")
+
+
+_PROGRESS_HEADER = "**Pipeline progress**\n\n"
+
+# Report views, in display order
+_TAB_NAMES: tuple[str, ...] = (
+    "Executive Summary",
+    "Scoping (0E/0P)",
+    "Market Sizing (Stage 1)",
+    "Categories & Segments",
+    "Pain Points & Demand",
+    "Competition & Gaps",
+    "Positioning (Stage 5)",
+    "Synthesis & Jury",
+    "Download",
+)
+
+
+@st.fragment(run_every=0.2)
+def _pipeline_monitor() -> None:
+    """
+    Poll the session's running pipeline: drain its events, redraw progress, and on completion
+    store the artifact (or the failure) and rerun the whole app. Only this fragment reruns
+    while polling, so the rest of the page stays interactive during a run.
+    """
+    job = st.session_state.get("_pipeline_job")
+    if job is None:
+        return
+    # Progress slot, made once per fragment run (one run = one tick) at the top of the fragment
+    slot = st.empty()
+    agent_lines = st.session_state["_agent_lines"]
+    events = job["events"]
+    while True:
+        try:
+            event = events.get_nowait()
+        except queue.Empty:
+            break
+        if event[0] == "progress":
+            _, job["msg"], job["p"], completed_agent = event
+            # Completed agents are bits in an int (bit i = AGENT_LABELS[i]); a line is rewritten once
+            if completed_agent is not None and 0 <= completed_agent < len(agent_lines):
+                bit = 1 << completed_agent
+                if not st.session_state["_completed_mask"] & bit:
+                    st.session_state["_completed_mask"] |= bit
+                    agent_lines[completed_agent] = f"- ✅ {AGENT_LABELS[completed_agent]}"
+        elif event[0] == "verdict":
+            job["verdicts"].append(event[1])
+        else:  # "reset_verdicts": the Jury is retrying and re-sends every verdict
+            job["verdicts"].clear()
+
+    future = job["future"]
+    if future.done():
+        del st.session_state["_pipeline_job"]
+        try:
+            artifact = future.result()
+        except Exception as e:
+            # Matched via the event, not the class: each rerun re-executes this script and
+            # redefines PipelineCancelled, so a run's exception may be an older class object.
+            if job["cancel"].is_set():
+                st.session_state["_pipeline_notice"] = ("warning", "Run cancelled.", None)
+            else:
+                st.session_state["_pipeline_notice"] = ("error", f"Pipeline failed: {e}", e)
+        else:
+            # Persist artifact in session for report view/download
+            st.session_state["artifact"] = artifact
+            st.session_state["artifact_key"] = make_key(artifact)
+            st.session_state["_pipeline_notice"] = ("success", "Report ready.", None)
+        st.rerun()
+
+    # Bar, checklist and verdicts are drawn into the slot together
+    with slot.container():
+        st.progress(min(1.0, max(0.0, job["p"])))
+        st.markdown(_PROGRESS_HEADER + "\n".join(agent_lines) + f"\n\n**Current:** {job['msg']}")
+        if job["verdicts"]:
+            st.markdown("\n".join(["**Segment verdicts (streaming)**", "", *job["verdicts"]]))
+    if job["cancel"].is_set():
+        st.caption("Cancelling after the current step…")
+    elif st.button("Cancel run"):
+        job["cancel"].set()
+
+
 st.set_page_config(page_title="Market Research AI", page_icon="📊", layout="wide")
 
-# Brick Red, Blue & White theme — custom CSS
-st.markdown("""
-<style>
-    /* Main title */
-    h1 {
-        color: #1E3A5F !important;
-        font-weight: 700 !important;
-        border-bottom: 3px solid #B22222;
-        padding-bottom: 0.3em;
-    }
-    /* Subtitle / body text */
-    p, .stMarkdown {
-        color: #1E3A5F !important;
-    }
-    /* Run Research button — single blue, white text, simple hover (shadow only) */
-    .stButton > button,
-    [data-testid="stButton"] button,
-    section.main .stButton button,
-    .stButton > button kbd,
-    .stButton > button span {
-        background-color: #1E3A5F !important;
-        color: #FFFFFF !important;
-        -webkit-text-fill-color: #FFFFFF !important;
-        font-weight: 600 !important;
-        border: none !important;
-        border-radius: 8px !important;
-        padding: 0.5rem 1.5rem !important;
-        transition: box-shadow 0.2s ease;
-    }
-    .stButton > button:hover,
-    [data-testid="stButton"] button:hover {
-        background-color: #1E3A5F !important;
-        color: #FFFFFF !important;
-        -webkit-text-fill-color: #FFFFFF !important;
-        box-shadow: 0 3px 10px rgba(30, 58, 95, 0.5);
-    }
-    /* Expander */
-    .streamlit-expanderHeader {
-        background: #F0F4F8 !important;
-        color: #1E3A5F !important;
-        border-left: 4px solid #B22222 !important;
-    }
-    /* Success message */
-    .stSuccess {
-        background: linear-gradient(90deg, #E8F0FE 0%, #F0F4F8 100%) !important;
-        border-left: 4px solid #2563EB !important;
-        color: #1E3A5F !important;
-    }
-    /* Report tabs — Brick red background, white text */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-    }
-    .stTabs [data-baseweb="tab"] {
-        background: #B22222 !important;
-        color: #FFFFFF !important;
-        -webkit-text-fill-color: #FFFFFF !important;
-        border-radius: 8px 8px 0 0;
-        border: 1px solid #8B0000;
-    }
-    .stTabs [data-baseweb="tab"] *,
-    .stTabs [data-baseweb="tab"] span {
-        color: #FFFFFF !important;
-        -webkit-text-fill-color: #FFFFFF !important;
-    }
-    .stTabs [aria-selected="true"] {
-        background: #8B0000 !important;
-        color: #FFFFFF !important;
-        -webkit-text-fill-color: #FFFFFF !important;
-    }
-    .stTabs [aria-selected="true"] *,
-    .stTabs [aria-selected="true"] span {
-        color: #FFFFFF !important;
-        -webkit-text-fill-color: #FFFFFF !important;
-    }
-    /* Progress bar */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, #B22222, #2563EB) !important;
-    }
-    /* Input field focus */
-    .stTextInput input:focus {
-        box-shadow: 0 0 0 2px #B22222 !important;
-        border-color: #B22222 !important;
-    }
-    /* Download buttons */
-    a[download] {
-        background: #2563EB !important;
-        color: white !important;
-        padding: 0.5rem 1rem !important;
-        border-radius: 8px !important;
-    }
-    /* Pipeline progress box */
-    div[data-testid="stMarkdownContainer"] p {
-        color: #1E3A5F !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Brick Red, Blue & White theme (static/app.css). Streamlit drops elements a rerun does not
+# emit, so the <style> tag is sent every rerun; only the file read is cached.
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
 st.title("Market Research AI")
 st.markdown("**Unified Dual-Mode Framework:** Exploratory (industry landscape) or Problem-Driven (validate an idea).")
@@ -203,17 +255,7 @@ user_passcode = st.text_input(
     help="Required when the app is protected. Contact the owner for access.",
 )
 
-run_clicked = st.button("Run Research")
-
-# Reinject button style after button so it wins over Streamlit theme
-st.markdown("""
-<style>
-.stButton > button { color: #FFFFFF !important; -webkit-text-fill-color: #FFFFFF !important; }
-.stButton > button * { color: #FFFFFF !important; -webkit-text-fill-color: #FFFFFF !important; }
-.stButton > button:hover { color: #FFFFFF !important; -webkit-text-fill-color: #FFFFFF !important; }
-.stButton > button:hover * { color: #FFFFFF !important; -webkit-text-fill-color: #FFFFFF !important; }
-</style>
-""", unsafe_allow_html=True)
+run_clicked = st.button("Run Research", disabled="_pipeline_job" in st.session_state)
 
 if run_clicked and not industry.strip():
     st.warning("Please enter an industry or area.")
@@ -231,32 +273,29 @@ if run_clicked and _required_passcode:
         )
         run_clicked = False
 
-if run_clicked and industry.strip():
-    progress_placeholder = st.empty()
-    bar = st.progress(0.0)
-    status = st.empty()
-    if "_completed_agents" not in st.session_state:
-        st.session_state["_completed_agents"] = set()
-    st.session_state["_completed_agents"].clear()
+if run_clicked and industry.strip() and "_pipeline_job" not in st.session_state:
+    events: queue.Queue = queue.Queue()
+    cancel = threading.Event()
 
+    # The callbacks run on the pipeline thread: they only hand events to the monitor, which
+    # owns the widgets. Setting cancel makes the next callback raise and unwind the run.
     def report_progress(msg: str, p: float, completed_agent: int | None = None) -> None:
-        if completed_agent is not None:
-            st.session_state["_completed_agents"].add(completed_agent)
-        bar.progress(min(1.0, max(0.0, p)))
-        completed = st.session_state["_completed_agents"]
-        lines = [f"- {'✅' if i in completed else '⏳'} {label}" for i, label in enumerate(AGENT_LABELS)]
-        status.markdown("\n".join([
-            "**Pipeline progress**",
-            "",
-            "\n".join(lines),
-            "",
-            f"**Current:** {msg}",
-        ]))
+        if cancel.is_set():
+            raise PipelineCancelled("Run cancelled.")
+        events.put(("progress", msg, p, completed_agent))
+
+    def report_verdict(v: SegmentVerdict) -> None:
+        events.put(("verdict", f"- {v.category_name} / {v.segment_name}: **{v.verdict}** — {v.rationale}"))
+
+    def reset_verdicts() -> None:
+        events.put(("reset_verdicts",))
 
     kwargs = dict(
         industry=industry.strip(),
         mode=mode,
         progress=report_progress,
+        on_jury_verdict=report_verdict,
+        on_jury_reset=reset_verdicts,
         output_path=_project_root / "output" / "artifact.json",
         max_categories=max_cat,
         max_segments_per_category=max_seg,
@@ -274,22 +313,27 @@ if run_clicked and industry.strip():
         kwargs["ai_advantage"] = (ai_advantage or "").strip()
         kwargs["hypotheses"] = hypotheses_list
 
-    try:
-        artifact = run_pipeline(**kwargs)
-    except Exception as e:
-        progress_placeholder.empty()
-        bar.empty()
-        status.empty()
-        st.error(f"Pipeline failed: {e}")
-        raise
-
-    progress_placeholder.empty()
-    bar.empty()
-    status.empty()
-    st.success("Report ready.")
-
-    # Persist artifact in session for report view/download
-    st.session_state["artifact"] = artifact
+    st.session_state["_completed_mask"] = 0
+    # Checklist lines are built once per run; a completion rewrites only its own line
+    st.session_state["_agent_lines"] = [f"- ⏳ {label}" for label in AGENT_LABELS]
+    st.session_state["_pipeline_job"] = {
+        "future": _pipeline_pool().submit(run_pipeline, **kwargs),
+        "events": events,
+        "cancel": cancel,
+        "msg": "Starting…",
+        "p": 0.0,
+        "verdicts": [],
+    }
+
+if "_pipeline_job" in st.session_state:
+    _pipeline_monitor()
+
+notice = st.session_state.pop("_pipeline_notice", None)
+if notice is not None:
+    kind, text, exc = notice
+    getattr(st, kind)(text)
+    if exc is not None:
+        st.exception(exc)
 
 # If we have an artifact (from this run or reload), show report
 artifact = st.session_state.get("artifact")
@@ -297,157 +341,192 @@ if artifact:
     st.divider()
     st.subheader("Report")
 
-    tab_names = [
-        "Executive Summary",
-        "Scoping (0E/0P)",
-        "Market Sizing (Stage 1)",
-        "Categories & Segments",
-        "Pain Points & Demand",
-        "Competition & Gaps",
-        "Positioning (Stage 5)",
-        "Synthesis & Jury",
-        "Download",
-    ]
-    tabs = st.tabs(tab_names)
-
-    s1 = artifact.get("section1") or {}
-    jury = artifact.get("jury") or {}
-    section2 = artifact.get("section2") or []
-    section3 = artifact.get("section3") or []
-    section4 = artifact.get("section4") or []
-    stage0e = artifact.get("stage0e") or {}
-    stage0p = artifact.get("stage0p") or {}
-    stage1 = artifact.get("stage1") or {}
-    stage5 = artifact.get("stage5") or {}
-    art_mode = artifact.get("mode") or "exploratory"
-
-    with tabs[0]:
+    # A radio instead of st.tabs: tabs run every body on each rerun, this renders only the selected view
+    active_tab = st.radio("View", _TAB_NAMES, horizontal=True, key="active_tab", label_visibility="collapsed")
+
+    # A reloaded artifact arrives without a key; hash it once and keep the key with it
+    if not st.session_state.get("artifact_key"):
+        st.session_state["artifact_key"] = make_key(artifact)
+    artifact_key = st.session_state["artifact_key"]
+
+    # Section slices only change with the artifact, so they are taken once per artifact_key
+    if st.session_state.get("_sections_key") != artifact_key:
+        st.session_state["_sections"] = (
+            artifact.get("section1") or {},
+            artifact.get("jury") or {},
+            artifact.get("section2") or [],
+            artifact.get("section3") or [],
+            artifact.get("section4") or [],
+            artifact.get("stage0e") or {},
+            artifact.get("stage0p") or {},
+            artifact.get("stage1") or {},
+            artifact.get("stage5") or {},
+            artifact.get("mode") or "exploratory",
+            f"market_research_{artifact.get('industry', 'report').replace(' ', '_')}",  # download file stem
+        )
+        st.session_state["_sections_key"] = artifact_key
+    (
+        s1, jury, section2, section3, section4, stage0e, stage0p, stage1, stage5, art_mode, file_stem
+    ) = st.session_state["_sections"]
+
+    def _render_summary() -> None:
         st.markdown(_jury_str(jury, "executive_summary") or s1.get("summary") or stage0e.get("summary") or stage0p.get("summary") or "No summary.")
 
-    with tabs[1]:
+    def _render_scoping() -> None:
+        # Each view is built as one markdown string: one element per view, not one per line
+        parts: list[str] = []
         if art_mode == RESEARCH_MODE_EXPLORATORY and stage0e:
-            st.markdown("**Stage 0E: Industry Taxonomy Map**")
             level1 = stage0e.get("level1_industry_name") or stage0e.get("industry")
-            st.markdown(f"**Level 1 (Industry):** {level1}")
-            st.markdown("**Industry boundaries:**")
-            st.markdown(stage0e.get("industry_boundaries") or "—")
-            st.markdown("**Value chain:** " + (stage0e.get("value_chain_summary") or "—"))
+            parts += [
+                "**Stage 0E: Industry Taxonomy Map**",
+                f"**Level 1 (Industry):** {level1}",
+                "**Industry boundaries:**",
+                stage0e.get("industry_boundaries") or "—",
+                "**Value chain:** " + (stage0e.get("value_chain_summary") or "—"),
+            ]
             if stage0e.get("industry_classification"):
-                st.markdown("**Industry classification (NAICS / analysts):** " + stage0e.get("industry_classification"))
+                parts.append("**Industry classification (NAICS / analysts):** " + stage0e.get("industry_classification"))
             if stage0e.get("pestel_overview"):
-                st.markdown("**PESTEL overview:**")
-                st.markdown(stage0e.get("pestel_overview"))
-            st.markdown("**4-level taxonomy**")
+                parts += ["**PESTEL overview:**", stage0e.get("pestel_overview")]
+            parts.append("**4-level taxonomy**")
+            taxonomy: list[str] = []
             for cat in stage0e.get("categories") or []:
-                st.markdown(f"- **L2 {cat.get('name')}** ({cat.get('size_range')}, {cat.get('growth_signal')})")
+                taxonomy.append(f"- **L2 {cat.get('name')}** ({cat.get('size_range')}, {cat.get('growth_signal')})")
                 for sc in cat.get("subcategories") or []:
                     for seg in sc.get("segments") or []:
-                        st.caption(f"  → L3 {sc.get('name')} / L4 {seg.get('name')}")
+                        taxonomy.append(f"  - L3 {sc.get('name')} / L4 {seg.get('name')}")
+            if taxonomy:
+                parts.append("\n".join(taxonomy))
             tq = stage0e.get("taxonomy_quantification") or {}
             if tq:
-                st.markdown("**Quantification:**")
-                st.markdown(f"Categories identified: **{tq.get('categories_count', '—')}**; Segments mapped: **{tq.get('segments_count', '—')}**")
+                parts += [
+                    "**Quantification:**",
+                    f"Categories identified: **{tq.get('categories_count', '—')}**; Segments mapped: **{tq.get('segments_count', '—')}**",
+                ]
                 if tq.get("size_orders_summary"):
-                    st.markdown("Size orders: " + tq.get("size_orders_summary"))
+                    parts.append("Size orders: " + tq.get("size_orders_summary"))
                 if tq.get("growth_signals_summary"):
-                    st.markdown("Growth signals: " + tq.get("growth_signals_summary"))
+                    parts.append("Growth signals: " + tq.get("growth_signals_summary"))
         elif stage0p:
-            st.markdown("**Stage 0P: Problem Statement Brief**")
-            st.markdown(stage0p.get("problem_statement") or "—")
-            st.markdown("**Target user:** " + (stage0p.get("target_user") or "—"))
-            st.markdown("**Target segment:** " + (stage0p.get("target_segment") or "—"))
+            parts += [
+                "**Stage 0P: Problem Statement Brief**",
+                stage0p.get("problem_statement") or "—",
+                "**Target user:** " + (stage0p.get("target_user") or "—"),
+                "**Target segment:** " + (stage0p.get("target_segment") or "—"),
+            ]
             for k in ("market_money", "user_behavior", "competition", "ai_advantage"):
                 if stage0p.get(k):
-                    st.markdown(f"**{k.replace('_', ' ').title()}:** {stage0p.get(k)}")
-            for h in stage0p.get("hypotheses") or []:
-                st.markdown(f"- {h}")
+                    parts.append(f"**{k.replace('_', ' ').title()}:** {stage0p.get(k)}")
+            hypotheses = stage0p.get("hypotheses") or []
+            if hypotheses:
+                parts.append("\n".join(f"- {h}" for h in hypotheses))
         else:
             st.info("No scoping data for this run.")
+            return
+        st.markdown("\n\n".join(parts))
 
-    with tabs[2]:
-        st.markdown("**Stage 1: Market Sizing**")
+    def _render_sizing() -> None:
+        parts = ["**Stage 1: Market Sizing**"]
         if stage1.get("mode_clarification"):
-            st.caption(stage1.get("mode_clarification"))
+            parts.append(stage1.get("mode_clarification"))
         if stage1.get("category_sizing_matrix"):
-            st.markdown("**Category × Segment matrix**")
+            parts.append("**Category × Segment matrix**")
+            rows: list[str] = []
             for row in stage1.get("category_sizing_matrix") or []:
-                st.markdown(f"- **{row.get('category_name')}**: TAM {row.get('market_size')} | Hist. CAGR {row.get('historical_cagr')} | Proj. CAGR {row.get('projected_cagr')} | Largest: {row.get('largest_segment_name')} ({row.get('largest_segment_size')}, {row.get('segment_cagr')}) | {row.get('growth_signal')}")
+                rows.append(f"- **{row.get('category_name')}**: TAM {row.get('market_size')} | Hist. CAGR {row.get('historical_cagr')} | Proj. CAGR {row.get('projected_cagr')} | Largest: {row.get('largest_segment_name')} ({row.get('largest_segment_size')}, {row.get('segment_cagr')}) | {row.get('growth_signal')}")
                 if row.get("key_segments"):
-                    st.caption("Key segments: " + ", ".join(row.get("key_segments") or []))
-                for d in row.get("growth_drivers") or []:
-                    st.caption("  ↑ " + d)
-                for h in row.get("headwinds") or []:
-                    st.caption("  ↓ " + h)
+                    rows.append("  - Key segments: " + _join(row["key_segments"], ", "))
+                rows.extend("  - ↑ " + d for d in row.get("growth_drivers") or [])
+                rows.extend("  - ↓ " + h for h in row.get("headwinds") or [])
+            parts.append("\n".join(rows))
         if stage1.get("tam_sam_som"):
             tss = stage1["tam_sam_som"]
-            st.markdown("**TAM:** " + (tss.get("tam") or "—"))
-            st.markdown("**SAM:** " + (tss.get("sam") or "—"))
-            st.markdown("**SOM:** " + (tss.get("som") or "—"))
-            st.markdown("**Assumptions:** " + (tss.get("assumptions") or "—"))
-        st.caption(stage1.get("summary") or "")
-
-    with tabs[3]:
-        st.markdown("**Categories, Market Cap & Trends**")
+            parts += [
+                "**TAM:** " + (tss.get("tam") or "—"),
+                "**SAM:** " + (tss.get("sam") or "—"),
+                "**SOM:** " + (tss.get("som") or "—"),
+                "**Assumptions:** " + (tss.get("assumptions") or "—"),
+            ]
+        if stage1.get("summary"):
+            parts.append(stage1.get("summary"))
+        st.markdown("\n\n".join(parts))
+
+    def _render_segments() -> None:
+        parts = ["**Categories, Market Cap & Trends**"]
+        cats: list[str] = []
         for c in s1.get("categories") or []:
-            st.markdown(f"- **{c.get('name')}**: TAM {c.get('tam')} / SOM {c.get('som')} | CAGR {c.get('historical_cagr')} → {c.get('projected_cagr')}")
-            st.caption("; ".join(c.get("trends") or []))
-        st.markdown("**Segmented Decomposition**")
+            cats.append(f"- **{c.get('name')}**: TAM {c.get('tam')} / SOM {c.get('som')} | CAGR {c.get('historical_cagr')} → {c.get('projected_cagr')}")
+            if c.get("trends"):
+                cats.append("  - " + _join(c["trends"]))
+        if cats:
+            parts.append("\n".join(cats))
+        parts.append("**Segmented Decomposition**")
         for cs in section2:
-            st.markdown(f"**{cs.get('category_name')}**")
+            parts.append(f"**{cs.get('category_name')}**")
+            segs: list[str] = []
             for seg in cs.get("segments") or []:
-                st.markdown(f"- **{seg.get('name')}** ({seg.get('segment_type')}): {seg.get('description')}")
-                st.caption("Drivers: " + "; ".join(seg.get("growth_drivers") or []))
+                segs.append(f"- **{seg.get('name')}** ({seg.get('segment_type')}): {seg.get('description')}")
+                segs.append("  - Drivers: " + _join(seg.get("growth_drivers")))
                 if seg.get("num_players_estimate") or seg.get("concentration_band"):
-                    st.caption(f"Players (est.): {seg.get('num_players_estimate') or '—'} | Concentration: {seg.get('concentration_band') or seg.get('hhi_note') or '—'}")
-                if seg.get("top_players"):
-                    for p in seg.get("top_players") or []:
-                        st.caption(f"  • {p.get('name')}: {p.get('market_share')} {p.get('market_share_band') or ''} | {p.get('business_model') or ''} | {p.get('pricing_note') or ''}")
+                    segs.append(f"  - Players (est.): {seg.get('num_players_estimate') or '—'} | Concentration: {seg.get('concentration_band') or seg.get('hhi_note') or '—'}")
+                for p in seg.get("top_players") or []:
+                    segs.append(f"    - {p.get('name')}: {p.get('market_share')} {p.get('market_share_band') or ''} | {p.get('business_model') or ''} | {p.get('pricing_note') or ''}")
                 if seg.get("segment_deep_dive_summary"):
-                    st.caption("Matrix row: " + seg.get("segment_deep_dive_summary"))
+                    segs.append("  - Matrix row: " + seg.get("segment_deep_dive_summary"))
+            if segs:
+                parts.append("\n".join(segs))
+        st.markdown("\n\n".join(parts))
 
-    with tabs[4]:
-        st.markdown("**User Pain Points & Demand**")
+    def _render_pain_points() -> None:
+        parts = ["**User Pain Points & Demand**"]
         for pp in section3:
-            st.markdown(f"**{pp.get('category_name')} / {pp.get('segment_name')}**")
-            st.markdown(f"- ZMOT: {pp.get('zero_moment_of_truth')}")
-            st.markdown(f"- Alternatives: {'; '.join(pp.get('alternative_paths') or [])}")
-            st.markdown(f"- Retention killers: {'; '.join(pp.get('retention_killers') or [])}")
+            parts += [
+                f"**{pp.get('category_name')} / {pp.get('segment_name')}**",
+                f"- ZMOT: {pp.get('zero_moment_of_truth')}\n"
+                f"- Alternatives: {_join(pp.get('alternative_paths'))}\n"
+                f"- Retention killers: {_join(pp.get('retention_killers'))}",
+            ]
             if pp.get("persona_summary"):
-                st.markdown("**Persona summary:** " + pp.get("persona_summary"))
+                parts.append("**Persona summary:** " + pp.get("persona_summary"))
             for pc in pp.get("persona_cards") or []:
-                st.markdown(f"  **Persona — {pc.get('name')}:** {pc.get('demographics')} | JTBD: {', '.join(pc.get('jobs_to_be_done') or [])} | WTP: {pc.get('willingness_to_pay_range')} | Channels: {pc.get('preferred_channels')}")
+                parts.append(f"**Persona — {pc.get('name')}:** {pc.get('demographics')} | JTBD: {_join(pc.get('jobs_to_be_done'), ', ')} | WTP: {pc.get('willingness_to_pay_range')} | Channels: {pc.get('preferred_channels')}")
             if pp.get("jobs_to_be_done"):
-                st.markdown("**JTBD:** " + "; ".join(pp.get("jobs_to_be_done") or []))
+                parts.append("**JTBD:** " + _join(pp["jobs_to_be_done"]))
             if pp.get("demand_signals"):
-                st.markdown("**Demand signals:** " + pp.get("demand_signals"))
+                parts.append("**Demand signals:** " + pp.get("demand_signals"))
             if pp.get("willingness_to_pay"):
-                st.markdown("**WTP:** " + pp.get("willingness_to_pay"))
+                parts.append("**WTP:** " + pp.get("willingness_to_pay"))
             if pp.get("customer_journey_summary"):
-                st.markdown("**Customer journey:** " + pp.get("customer_journey_summary"))
+                parts.append("**Customer journey:** " + pp.get("customer_journey_summary"))
+        st.markdown("\n\n".join(parts))
 
-    with tabs[5]:
-        st.markdown("**Competition, Delivery & Gaps**")
+    def _render_competition() -> None:
+        parts = ["**Competition, Delivery & Gaps**"]
         for cg in section4:
-            st.markdown(f"**{cg.get('category_name')} / {cg.get('segment_name')}**")
-            st.markdown(f"- Delivery: {', '.join(cg.get('delivery_mechanisms') or [])}")
-            st.markdown(f"- Product gaps: {'; '.join(cg.get('product_feature_gaps') or [])}")
-            st.markdown(f"- Moat: {cg.get('moat_assessment')}")
+            parts += [
+                f"**{cg.get('category_name')} / {cg.get('segment_name')}**",
+                f"- Delivery: {_join(cg.get('delivery_mechanisms'), ', ')}\n"
+                f"- Product gaps: {_join(cg.get('product_feature_gaps'))}\n"
+                f"- Moat: {cg.get('moat_assessment')}",
+            ]
             if cg.get("porter_five_forces_summary"):
-                st.markdown("**Porter's Five Forces (summary):** " + cg.get("porter_five_forces_summary"))
+                parts.append("**Porter's Five Forces (summary):** " + cg.get("porter_five_forces_summary"))
             if cg.get("porter_five_forces_detail"):
-                st.markdown("**Porter's Five Forces (detail):** " + cg.get("porter_five_forces_detail"))
+                parts.append("**Porter's Five Forces (detail):** " + cg.get("porter_five_forces_detail"))
             if cg.get("feature_matrix_summary"):
-                st.markdown("**Feature matrix:** " + cg.get("feature_matrix_summary"))
+                parts.append("**Feature matrix:** " + cg.get("feature_matrix_summary"))
             if cg.get("positioning_2x2_axes"):
-                st.markdown("**2×2 axes:** " + cg.get("positioning_2x2_axes"))
+                parts.append("**2×2 axes:** " + cg.get("positioning_2x2_axes"))
             if cg.get("positioning_2x2_note"):
-                st.markdown("**2×2 positioning:** " + cg.get("positioning_2x2_note"))
+                parts.append("**2×2 positioning:** " + cg.get("positioning_2x2_note"))
             for bc in cg.get("battle_cards") or []:
-                st.markdown(f"  **Battle card — {bc.get('competitor_name')}:** {bc.get('value_proposition')} | Pricing: {bc.get('pricing') or '—'} | GTM: {bc.get('gtm_summary') or '—'}")
+                card = f"**Battle card — {bc.get('competitor_name')}:** {bc.get('value_proposition')} | Pricing: {bc.get('pricing') or '—'} | GTM: {bc.get('gtm_summary') or '—'}"
                 if bc.get("key_features"):
-                    st.caption("Features: " + ", ".join(bc.get("key_features") or []))
+                    card += "\n- Features: " + _join(bc["key_features"], ", ")
+                parts.append(card)
+        st.markdown("\n\n".join(parts))
 
-    with tabs[6]:
+    def _render_positioning() -> None:
         if art_mode == RESEARCH_MODE_PROBLEM_DRIVEN and stage5:
             st.markdown("**Stage 5: Positioning & GTM**")
             st.markdown("**Positioning statement:** " + (stage5.get("positioning_statement") or "—"))
@@ -478,7 +557,7 @@ if artifact:
         else:
             st.info("Positioning (Stage 5) runs only in Problem-Driven mode.")
 
-    with tabs[7]:
+    def _render_jury() -> None:
         st.markdown("**Conflict Check**")
         st.markdown(_jury_str(jury, "conflict_check") or "—")
         st.markdown("**Moat Assessment**")
@@ -486,10 +565,9 @@ if artifact:
         st.markdown("**Resource Allocation ($1M)**")
         st.markdown(_jury_str(jury, "resource_allocation") or "—")
         st.markdown("**Segment Verdicts**")
-        for v in jury.get("segment_verdicts") or []:
-            if not isinstance(v, dict):
-                continue
-            st.markdown(f"- {_coerce_str(v.get('category_name'))} / {_coerce_str(v.get('segment_name'))}: **{_coerce_str(v.get('verdict'))}** — {_coerce_str(v.get('rationale'))}")
+        verdicts = _verdict_markdown(artifact_key, jury)
+        if verdicts:
+            st.markdown(verdicts)
         if jury.get("opportunity_heat_map_summary"):
             st.markdown("**Opportunity heat map:** " + _jury_str(jury, "opportunity_heat_map_summary"))
         attr = jury.get("segment_attractiveness_table") or []
@@ -524,21 +602,39 @@ if artifact:
                 for b in bullets:
                     st.caption("• " + str(b))
 
-    with tabs[8]:
-        pdf_bytes = build_pdf(artifact)
+    def _render_download() -> None:
+        # Session-level guard in front of the shared cache: reruns on the same artifact reuse the
+        # stored pair instead of paying st.cache_data's lookup and unpickled copy of the HTML
+        if st.session_state.get("_reports_key") != artifact_key:
+            st.session_state["_reports"] = _cached_reports(artifact_key, artifact)
+            st.session_state["_reports_key"] = artifact_key
+        pdf_bytes, html_content = st.session_state["_reports"]
         st.download_button(
             "Download PDF",
             data=pdf_bytes,
-            file_name=f"market_research_{artifact.get('industry', 'report').replace(' ', '_')}.pdf",
+            file_name=f"{file_stem}.pdf",
             mime="application/pdf",
         )
-        html_content = build_html(artifact)
         st.download_button(
             "Download HTML",
             data=html_content,
-            file_name=f"market_research_{artifact.get('industry', 'report').replace(' ', '_')}.html",
+            file_name=f"{file_stem}.html",
             mime="text/html",
         )
-        st.markdown("---")
-        st.markdown("Preview (HTML):")
-        st.components.v1.html(html_content, height=600, scrolling=True)
+        # The preview iframe carries the whole report; only build it when asked for
+        with st.expander("Preview (HTML)", expanded=False):
+            if st.checkbox("Load preview", key="_preview_on"):
+                st.components.v1.html(html_content, height=600, scrolling=True)
+
+    renderers = dict(zip(_TAB_NAMES, (
+        _render_summary,
+        _render_scoping,
+        _render_sizing,
+        _render_segments,
+        _render_pain_points,
+        _render_competition,
+        _render_positioning,
+        _render_jury,
+        _render_download,
+    )))
+    renderers[active_tab]()